@@ -26,21 +26,31 @@ def add_snwtp_parameter():
     scenarios = pl.read_parquet(scenarios_path)
     print(f"Original scenarios: {scenarios.height}")
     
+    # Keep the original order so SNWTP can be nested innermost below
+    scenarios = scenarios.with_row_index("source_row")
+
     # Create SNWTP=0 scenarios
     scenarios_no_snwtp = scenarios.with_columns(pl.lit(0).alias("SNWTP"))
     
     # Create SNWTP=1 scenarios
     scenarios_with_snwtp = scenarios.with_columns(pl.lit(1).alias("SNWTP"))
     
-    # Combine both sets
-    new_scenarios = pl.concat([scenarios_no_snwtp, scenarios_with_snwtp])
+    # Combine both sets, interleaved so each original scenario is followed by
+    # its SNWTP twin: SNWTP is the innermost parameter and scenario_id order
+    # keeps the leading parameters in contiguous blocks
+    new_scenarios = (
+        pl.concat([scenarios_no_snwtp, scenarios_with_snwtp])
+        .sort("source_row", "SNWTP")
+        .drop("source_row")
+    )
     
     print(f"New scenarios with SNWTP: {new_scenarios.height}")
     print("SNWTP parameter values:", new_scenarios["SNWTP"].unique().to_list())
     
-    # Update scenario names to be unique
+    # Update scenario names and ids to be unique
     new_scenarios = new_scenarios.with_row_count("row_id").with_columns(
-        pl.format("sc_{}", pl.col("row_id")).alias("scenario_name")
+        pl.format("sc_{}", pl.col("row_id")).alias("scenario_name"),
+        pl.col("row_id").cast(pl.UInt32).alias("scenario_id"),
     ).drop("row_id")
     
     # Ensure scenario_name is categorical
@@ -51,7 +61,7 @@ def add_snwtp_parameter():
     # Backup original file
     backup_path = scenarios_path.with_suffix(".parquet.backup")
     print(f"Creating backup: {backup_path}")
-    scenarios.write_parquet(backup_path)
+    scenarios.drop("source_row").write_parquet(backup_path)
     
     # Write new scenarios
     print(f"Writing new scenarios to: {scenarios_path}")
@@ -133,6 +133,23 @@ def _read_time() -> pl.DataFrame:
     return pl.read_parquet(DATA_PARQUET / "time.parquet")
 
 
+def _read_scenario_rows(var_path: Path, scenario: str) -> pl.DataFrame:
+    """Read one scenario's rows from a variable Parquet file.
+
+    Variable files are keyed by the integer scenario_id; older files carry
+    scenario_name instead, so both layouts are handled.
+    """
+    lf = pl.scan_parquet(var_path)
+    if "scenario_id" in lf.collect_schema().names():
+        scenario_ids = (
+            _read_scenarios()
+            .filter(pl.col("scenario_name") == scenario)
+            .get_column("scenario_id")
+        )
+        return lf.filter(pl.col("scenario_id").is_in(scenario_ids.implode())).collect()
+    return lf.filter(pl.col("scenario_name") == scenario).collect()
+
+
 def _get_basin_geojson() -> dict:
     """Read Yellow River Basin shapefile and return GeoJSON.
 
@@ -409,7 +426,7 @@ def get_params() -> Dict[str, List]:
     scenarios = _read_scenarios()
     params = {}
     for c in scenarios.columns:
-        if c == "scenario_name":
+        if c in ("scenario_id", "scenario_name"):
             continue
         params[c] = scenarios.get_column(c).unique().sort().to_list()
     return params
@@ -464,7 +481,7 @@ def get_series(
             status_code=404, detail=f"Variable parquet not found for '{variable}'"
         )
 
-    df = pl.read_parquet(var_path).filter(pl.col("scenario_name") == scenario)
+    df = _read_scenario_rows(var_path, scenario)
     if df.height == 0:
         raise HTTPException(status_code=404, detail="Scenario not found for variable")
     if start_step is not None:
@@ -653,21 +670,19 @@ def get_series_multi(
             }
         else:
             # Return all scenarios separately
+            # One pass splits the frame per scenario (no per-name full filter)
             scenarios = []
-            for scenario_name in data["scenario_name"].unique().to_list():
-                scenario_data = data.filter(
-                    pl.col("scenario_name") == scenario_name
-                ).sort("step")
-
+            for scenario_data in data.sort("scenario_name", "step").partition_by(
+                "scenario_name", maintain_order=True
+            ):
                 # Extract parameter values for this scenario
                 params = {}
-                if scenario_data.height > 0:
-                    for param in param_cols:
-                        params[param] = scenario_data[param][0]
+                for param in param_cols:
+                    params[param] = scenario_data[param][0]
 
                 scenarios.append(
                     {
-                        "scenario_name": scenario_name,
+                        "scenario_name": scenario_data["scenario_name"][0],
                         "parameters": params,
                         "series": {
                             "time": scenario_data["time"].to_list(),
@@ -718,7 +733,7 @@ def get_series_statistics(
         )
 
     # Load and filter data
-    df = pl.read_parquet(var_path).filter(pl.col("scenario_name") == scenario)
+    df = _read_scenario_rows(var_path, scenario)
     if df.height == 0:
         raise HTTPException(
             status_code=404,
@@ -14,12 +14,14 @@ from __future__ import annotations
 
 import argparse
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple, Union
 
 import plotly.graph_objects as go
 import polars as pl
-from dash import ALL, Dash, Input, Output, dcc, html
+import pyarrow.parquet as pq
+from dash import ALL, Dash, Input, Output, Patch, dcc, html
 
 
 def parse_args() -> argparse.Namespace:
@@ -69,6 +71,94 @@ def read_variables_from_metadata(metadata_path: Path) -> List[str]:
     return names
 
 
+def build_base_figure() -> go.Figure:
+    """Create the figure the series plot starts with.
+
+    Callbacks only patch its single trace and a few layout fields, so the
+    full figure is sent to the browser once.
+
+    Returns:
+        go.Figure: Figure with one empty line trace and the fixed layout.
+    """
+    fig = go.Figure(go.Scatter(x=[], y=[], mode="lines", name=""))
+    fig.update_layout(
+        title=dict(text=""),
+        xaxis_title="Time",
+        yaxis_title="",
+        margin=dict(l=40, r=20, t=60, b=40),
+    )
+    return fig
+
+
+def message_patch(title: str) -> Patch:
+    """Clear the plotted series and show a message as the figure title.
+
+    Args:
+        title: Message to display.
+
+    Returns:
+        Patch: Partial figure update.
+    """
+    patched = Patch()
+    patched["data"][0]["x"] = []
+    patched["data"][0]["y"] = []
+    patched["data"][0]["name"] = ""
+    patched["layout"]["title"]["text"] = title
+    return patched
+
+
+@lru_cache(maxsize=128)
+def open_parquet(path: str) -> pq.ParquetFile:
+    """Return a persistent ParquetFile handle so the footer is parsed only once.
+
+    Args:
+        path: Path to a variable parquet file.
+
+    Returns:
+        pq.ParquetFile: Cached reader for the file.
+    """
+    return pq.ParquetFile(path)
+
+
+def scenario_key_column(path: str) -> str:
+    """Return the column a variable file is keyed by.
+
+    Args:
+        path: Path to a variable parquet file.
+
+    Returns:
+        str: "scenario_id", or "scenario_name" for files written before it existed.
+    """
+    names = open_parquet(path).schema_arrow.names
+    return "scenario_id" if "scenario_id" in names else "scenario_name"
+
+
+@lru_cache(maxsize=128)
+def scenario_row_groups(path: str) -> Dict[Union[int, str], Tuple[int, ...]]:
+    """Map each scenario key to the row groups of a variable file containing it.
+
+    Footer statistics written for Polars categoricals are not reliable, so the
+    key column is scanned once per file instead.
+
+    Args:
+        path: Path to a variable parquet file.
+
+    Returns:
+        Dict[Union[int, str], Tuple[int, ...]]: Row group indices keyed by
+        scenario_id, or by scenario_name for older files.
+    """
+    pf = open_parquet(path)
+    key = scenario_key_column(path)
+    groups: Dict[Union[int, str], List[int]] = {}
+    for i in range(pf.num_row_groups):
+        keys = pl.from_arrow(pf.read_row_group(i, columns=[key])).get_column(key)
+        if keys.dtype == pl.Categorical:
+            keys = keys.cast(pl.Utf8)
+        for k in keys.unique().to_list():
+            groups.setdefault(k, []).append(i)
+    return {k: tuple(idx) for k, idx in groups.items()}
+
+
 def build_app(data_parquet: Path, data_dir: Path) -> Dash:
     """Create Dash app with variable/scenario selectors and a time series figure.
 
@@ -81,8 +171,10 @@ def build_app(data_parquet: Path, data_dir: Path) -> Dash:
     """
     time_df = pl.read_parquet(data_parquet / "time.parquet")
     scenarios_df = pl.read_parquet(data_parquet / "scenarios.parquet")
-    # Parameter columns (all columns except scenario_name)
-    param_cols = [c for c in scenarios_df.columns if c != "scenario_name"]
+    # Parameter columns (all columns except the scenario keys)
+    param_cols = [
+        c for c in scenarios_df.columns if c not in ("scenario_id", "scenario_name")
+    ]
     # Unique sorted values per parameter
     param_values = {
         p: scenarios_df.get_column(p).unique().sort().to_list() for p in param_cols
@@ -93,6 +185,12 @@ def build_app(data_parquet: Path, data_dir: Path) -> Dash:
     variables = read_variables_from_metadata(data_dir / "metadata.json")
     variables = sorted(variables)
 
+    # Dropdown options are built once, not inline in the layout expression
+    variable_options = [{"label": v, "value": v} for v in variables]
+    param_options = {
+        p: [{"label": str(v), "value": v} for v in param_values[p]] for p in param_cols
+    }
+
     app = Dash(__name__)
     app.title = "Decision Theater Explorer"
 
@@ -106,7 +204,7 @@ def build_app(data_parquet: Path, data_dir: Path) -> Dash:
                             html.Label("Variable"),
                             dcc.Dropdown(
                                 id="variable",
-                                options=[{"label": v, "value": v} for v in variables],
+                                options=variable_options,
                                 value=variables[0] if variables else None,
                                 clearable=False,
                             ),
@@ -147,10 +245,7 @@ def build_app(data_parquet: Path, data_dir: Path) -> Dash:
                             html.Label(p),
                             dcc.Dropdown(
                                 id={"type": "param", "name": p},
-                                options=[
-                                    {"label": str(v), "value": v}
-                                    for v in param_values[p]
-                                ],
+                                options=param_options[p],
                                 value=baseline.get(p),
                                 clearable=False,
                             ),
@@ -166,7 +261,11 @@ def build_app(data_parquet: Path, data_dir: Path) -> Dash:
                 ],
                 style={"marginBottom": "12px"},
             ),
-            dcc.Graph(id="series-plot", style={"height": "70vh"}),
+            dcc.Graph(
+                id="series-plot",
+                figure=build_base_figure(),
+                style={"height": "70vh"},
+            ),
         ],
         style={"padding": "16px"},
     )
@@ -181,43 +280,51 @@ def build_app(data_parquet: Path, data_dir: Path) -> Dash:
     def update_figure_from_params(variable: str, selected_values: list):  # noqa: D401
         """Update figure and resolved scenario based on selected parameters."""
         if not variable or not selected_values:
-            return go.Figure(), ""
+            return message_patch(""), ""
 
         # Build filter expression in the order of param_cols used in layout
         conditions = [pl.col(p) == v for p, v in zip(param_cols, selected_values)]
         if not conditions:
-            return go.Figure(), ""
+            return message_patch(""), ""
         matched = scenarios_df.filter(pl.all_horizontal(conditions))
         if matched.height == 0:
-            fig = go.Figure()
-            fig.update_layout(title="No scenario matches the selected parameters")
-            return fig, ""
+            return message_patch("No scenario matches the selected parameters"), ""
         scenario_name = matched.get_column("scenario_name").item()
 
         var_path = data_parquet / f"{variable}.parquet"
         if not var_path.exists():
-            fig = go.Figure()
-            fig.update_layout(title=f"Missing Parquet for variable: {variable}")
-            return fig, scenario_name
-
-        df = pl.read_parquet(var_path).filter(pl.col("scenario_name") == scenario_name)
-        df = df.join(time_df, on="step", how="left").sort("step")
+            return (
+                message_patch(f"Missing Parquet for variable: {variable}"),
+                scenario_name,
+            )
 
-        fig = go.Figure()
-        fig.add_trace(
-            go.Scatter(
-                x=df.get_column("time").to_list(),
-                y=df.get_column("value").to_list(),
-                mode="lines",
-                name=f"{variable} | {scenario_name}",
+        path = str(var_path)
+        key_col = scenario_key_column(path)
+        if key_col == "scenario_id":
+            key = matched.get_column("scenario_id").item()
+        else:
+            key = scenario_name
+        row_groups = scenario_row_groups(path).get(key)
+        if not row_groups:
+            return (
+                message_patch(f"No data for scenario: {scenario_name}"),
+                scenario_name,
             )
+        # Decode only the filter key and the two plotted columns
+        table = open_parquet(path).read_row_groups(
+            list(row_groups), columns=[key_col, "step", "value"]
         )
-        fig.update_layout(
-            xaxis_title="Time",
-            yaxis_title=variable,
-            margin=dict(l=40, r=20, t=60, b=40),
-        )
-        return fig, scenario_name
+        df = pl.from_arrow(table).filter(pl.col(key_col) == key).select("step", "value")
+        df = df.join(time_df, on="step", how="left").sort("step")
+
+        # Only the trace data and labels travel to the browser
+        patched = Patch()
+        patched["data"][0]["x"] = df.get_column("time").to_list()
+        patched["data"][0]["y"] = df.get_column("value").to_list()
+        patched["data"][0]["name"] = f"{variable} | {scenario_name}"
+        patched["layout"]["title"]["text"] = ""
+        patched["layout"]["yaxis"]["title"]["text"] = variable
+        return patched, scenario_name
 
     return app
 
@@ -0,0 +1,172 @@
+"""Rewrite a legacy Parquet dataset into the scenario-clustered, indexed layout.
+
+Datasets built before variable files were keyed by `scenario_id` store rows
+step-major with a `scenario_name` column, so every row group spans all
+scenarios and a scenario filter has to decode the whole file. This script
+converts such a dataset in place (or into --out-dir) without the raw CSVs:
+
+1) Add `scenario_id` to scenarios.parquet if missing
+2) Rewrite each legacy variable file as scenario_id, step, value sorted by
+   (scenario_id, step), with the same write options as preprocess_to_parquet.py
+3) Write index/{name}.parquet (scenario_id -> row group) for each variable and
+   index/params.parquet (parameter inverted index)
+
+Files already in the new layout are left untouched, so the script can be re-run.
+Converting in place overwrites the legacy files; pass --out-dir to keep them.
+
+Run
+    poetry run python scripts/migrate_parquet_layout.py --data-dir data_parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import polars as pl
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.preprocess_to_parquet import (  # noqa: E402
+    build_param_index,
+    build_row_group_index,
+    parquet_write_options,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert a legacy Parquet dataset to the indexed layout"
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path("data_parquet"),
+        help="Dataset to convert (default: data_parquet)",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        default=None,
+        help="Output directory (default: convert --data-dir in place)",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=3,
+        help="Zstd compression level (default: 3)",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=50_000,
+        help="Rows per Parquet row group (default: 50000)",
+    )
+    return parser.parse_args()
+
+
+def _replace_parquet(
+    df: pl.DataFrame, path: Path, write_options: Dict[str, Any]
+) -> None:
+    """Write a frame next to `path` and atomically move it into place.
+
+    Args:
+        df: Frame to write
+        path: Destination Parquet file
+        write_options: Parquet write options from `parquet_write_options`
+    """
+    tmp = path.with_suffix(".parquet.tmp")
+    df.write_parquet(tmp, **write_options)
+    os.replace(tmp, path)
+
+
+def migrate_scenarios(out_dir: Path, write_options: Dict[str, Any]) -> pl.DataFrame:
+    """Ensure scenarios.parquet carries the integer `scenario_id` key.
+
+    Args:
+        out_dir: Dataset being converted
+        write_options: Parquet write options from `parquet_write_options`
+
+    Returns:
+        The scenarios table with `scenario_id`.
+    """
+    scenarios = pl.read_parquet(out_dir / "scenarios.parquet")
+    if "scenario_id" not in scenarios.columns:
+        # Legacy scenario_name is "sc_{row_index}", so the id is the row index
+        scenarios = scenarios.with_row_index("scenario_id")
+        _replace_parquet(scenarios, out_dir / "scenarios.parquet", write_options)
+    return scenarios
+
+
+def migrate_variable(
+    var_file: Path, keys: pl.DataFrame, write_options: Dict[str, Any]
+) -> None:
+    """Rewrite one legacy variable file in place, keyed and clustered by `scenario_id`.
+
+    Args:
+        var_file: Legacy variable file (scenario_name, step, value[, variable])
+        keys: scenario_name -> scenario_id mapping
+        write_options: Parquet write options from `parquet_write_options`
+    """
+    long = (
+        pl.scan_parquet(var_file)
+        .join(keys.lazy(), on="scenario_name", how="inner")
+        .select(
+            "scenario_id",
+            pl.col("step").cast(pl.UInt16),
+            "value",
+        )
+        .sort("scenario_id", "step")
+        .collect()
+    )
+    _replace_parquet(long, var_file, write_options)
+
+
+def main() -> None:
+    """Entrypoint to convert a legacy dataset to the indexed layout."""
+    args = parse_args()
+    data_dir: Path = args.data_dir
+    out_dir: Path = args.out_dir or data_dir
+    write_options = parquet_write_options(
+        "zstd", args.compression_level, args.row_group_size
+    )
+
+    if not data_dir.exists():
+        raise FileNotFoundError(f"Data directory not found: {data_dir}")
+    if out_dir != data_dir:
+        # Start from a full copy so non-variable files (time, historical, maps)
+        # come along; variable files are then rewritten in place
+        shutil.copytree(data_dir, out_dir, dirs_exist_ok=True)
+
+    scenarios = migrate_scenarios(out_dir, write_options)
+    keys = scenarios.select(
+        pl.col("scenario_name").cast(pl.Categorical),
+        pl.col("scenario_id").cast(pl.UInt32),
+    )
+
+    for var_file in sorted(out_dir.glob("*.parquet")):
+        if var_file.stem in ("time", "scenarios"):
+            continue
+        schema = pl.read_parquet_schema(var_file)
+        if not {"step", "value"} <= set(schema):
+            continue  # not a scenario variable (e.g. historical series)
+        if "scenario_name" in schema and "scenario_id" not in schema:
+            print(f"[INFO] Migrating {var_file.name}", flush=True)
+            migrate_variable(var_file, keys, write_options)
+        build_row_group_index(var_file, out_dir / "index" / var_file.name)
+
+    build_param_index(out_dir, write_options)
+    print(f"[DONE] Indexed dataset written to: {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
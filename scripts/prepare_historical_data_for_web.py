@@ -10,19 +10,31 @@ from pathlib import Path
 import numpy as np
 import polars as pl
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 
 def linear_interpolate(years, values, target_years):
     """Linear interpolation for missing years.
 
     Args:
-        years: List of known years
-        values: List of known values
-        target_years: List of years to interpolate
+        years: Array of known years
+        values: Array of known values
+        target_years: Array of years to interpolate
 
     Returns:
-        List of interpolated values for target_years
+        Array of interpolated values for target_years
     """
-    return np.interp(target_years, years, values).tolist()
+    return np.interp(target_years, years, values)
+
+
+def _json_default(obj):
+    """Convert NumPy arrays and scalars to plain Python objects for JSON."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 def prepare_historical_data():
@@ -32,22 +44,22 @@ def prepare_historical_data():
     df_forest = pl.read_parquet("data_parquet/forest_coverage_historical.parquet")
 
     # Get sediment data sorted by year
-    sediment_years = df_sediment["Year"].to_list()
-    sediment_values = df_sediment["Sediment (10^8t)"].to_list()
+    sediment_years = df_sediment["Year"].to_numpy()
+    sediment_values = df_sediment["Sediment (10^8t)"].to_numpy()
     sediment_categories = df_sediment["Cate"].to_list()
 
     # Get forest data sorted by year
-    forest_years = df_forest["year"].to_list()
-    forest_values = df_forest["forest"].to_list()
+    forest_years = df_forest["year"].to_numpy()
+    forest_values = df_forest["forest"].to_numpy()
 
     # Determine the overlapping range for slider (800-1990)
     # But we'll provide full range data
-    min_year = min(sediment_years)
-    max_year = max(sediment_years)
+    min_year = int(sediment_years.min())
+    max_year = int(sediment_years.max())
 
     # For forest: 800-1990
-    forest_min_year = min(forest_years)
-    forest_max_year = max(forest_years)
+    forest_min_year = int(forest_years.min())
+    forest_max_year = int(forest_years.max())
 
     print(f"Sediment year range: {min_year} to {max_year}")
     print(f"Forest year range: {forest_min_year} to {forest_max_year}")
@@ -55,7 +67,7 @@ def prepare_historical_data():
 
     # Create interpolated data for the common range (800-1990) at 10-year intervals
     # This gives smooth slider experience
-    common_years = list(range(forest_min_year, forest_max_year + 1, 10))
+    common_years = np.arange(forest_min_year, forest_max_year + 1, 10)
 
     # Interpolate sediment values for common years
     sediment_interpolated = linear_interpolate(
@@ -96,8 +108,20 @@ def prepare_historical_data():
     output_dir.mkdir(exist_ok=True)
     output_file = output_dir / "historical_data.json"
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        # orjson serializes NumPy arrays natively, no list conversion needed
+        output_file.write_bytes(
+            orjson.dumps(
+                output_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        )
+    else:
+        with open(output_file, "w", encoding="utf-8") as f:
+            # Arrays are only converted to lists here, at serialization time
+            json.dump(
+                output_data, f, indent=2, ensure_ascii=False, default=_json_default
+            )
 
     print("\n✓ Data prepared successfully!")
     print(f"  Output file: {output_file}")
@@ -5,82 +5,139 @@ This script loads all climate factor data from Excel files, standardizes data ty
 and exports to Parquet format for efficient loading and type consistency.
 """
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import pandas as pd
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 
+# Most-filtered columns first, so equal values form long runs for ZSTD/RLE
+# and row-group statistics stay tight
+SORT_COLUMNS = ["Variable", "Scenario", "CropType", "Year"]
 
-def process_excel_to_parquet(excel_file, output_dir, variable_name):
+# Low-cardinality string columns, stored dictionary-encoded. Indices are int32
+# (Polars writes uint32, which pyarrow cannot convert to pandas categoricals)
+CATEGORICAL_COLUMNS = ["Scenario", "Variable", "CropType"]
+DICTIONARY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+
+def _write_parquet(df, output_file):
     """
-    Convert Excel file with multiple sheets to unified Parquet format.
+    Write a climate frame with ZSTD compression and row-group statistics.
+
+    Low-cardinality string columns are dictionary-encoded here, at write
+    time, so in-memory frames from different workers concatenate as plain
+    strings. The files read as categoricals in both Polars and pandas.
 
     Parameters
     ----------
-    excel_file : Path
-        Path to the Excel file.
-    output_dir : Path
-        Directory to save output parquet files.
-    variable_name : str
-        Name of the climate variable (Pe, ET0, ETc, IWR).
+    df : pl.DataFrame
+        Frame to write, already sorted by ``SORT_COLUMNS``.
+    output_file : Path
+        Destination parquet path.
     """
-    print(f"Processing {variable_name}...")
-
-    # Read all sheets
-    xls = pd.ExcelFile(excel_file)
-    all_data = []
-
-    for sheet_name in xls.sheet_names:
-        print(f"  - Sheet: {sheet_name}")
+    table = df.to_arrow()
+    schema = pa.schema(
+        [
+            pa.field(
+                f.name, DICTIONARY_TYPE if f.name in CATEGORICAL_COLUMNS else f.type
+            )
+            for f in table.schema
+        ]
+    )
+    pq.write_table(
+        table.cast(schema),
+        output_file,
+        compression="zstd",
+        compression_level=3,
+        write_statistics=True,
+        row_group_size=50_000,
+    )
+
+
+def _process_sheet(df_pl, sheet_name, variable_name):
+    """
+    Convert one parsed Excel sheet to the long climate-data layout.
 
-        # Read sheet
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    Parameters
+    ----------
+    df_pl : pl.DataFrame
+        Sheet contents, first column holding the year.
+    sheet_name : str
+        Name of the sheet (crop type).
+    variable_name : str
+        Name of the climate variable (Pe, ET0, ETc, IWR).
 
-        # Convert to polars
-        df_pl = pl.from_pandas(df)
+    Returns
+    -------
+    pl.LazyFrame
+        Long-format plan with Year, Scenario, Value, Variable, CropType.
+    """
+    print(f"  - Sheet: {sheet_name}")
 
-        # Get column names
-        cols = df_pl.columns
-        year_col = cols[0]
+    # Get column names
+    cols = df_pl.columns
+    year_col = cols[0]
 
+    # Drop year 2000 (as mentioned in documentation) before the melt
+    return (
+        df_pl.lazy()
+        .rename({year_col: "Year"})
+        .filter(pl.col("Year").cast(pl.Int64) > 2000)
         # Melt to long format
-        df_long = df_pl.melt(
-            id_vars=year_col,
-            value_vars=cols[1:],
+        .unpivot(
+            index="Year",
+            on=cols[1:],
             variable_name="Scenario",
             value_name="Value",
         )
-
-        # Rename year column if needed
-        if year_col != "Year":
-            df_long = df_long.rename({year_col: "Year"})
-
-        # Remove _corrected suffix for consistency (some Excel files have it, some don't)
-        df_long = df_long.with_columns(
-            pl.col("Scenario").str.replace("_corrected", "").alias("Scenario")
-        )
-
-        # Cast all numeric columns to Float32 to reduce file size
-        df_long = df_long.with_columns(
+        # Cast all numeric columns to Float32 to reduce file size, and remove
+        # _corrected suffix for consistency (some Excel files have it, some don't)
+        .with_columns(
             [
                 pl.col("Year").cast(pl.Int64),
+                pl.col("Scenario").str.replace("_corrected", ""),
                 pl.col("Value").cast(pl.Float32),
                 pl.lit(variable_name).alias("Variable"),
                 pl.lit(sheet_name).alias("CropType"),
             ]
         )
+    )
 
-        all_data.append(df_long)
 
-    # Concatenate all sheets
-    combined = pl.concat(all_data)
+def process_excel_to_parquet(excel_file, output_dir, variable_name):
+    """
+    Convert Excel file with multiple sheets to unified Parquet format.
 
-    # Filter out year 2000 as mentioned in documentation
-    combined = combined.filter(pl.col("Year") > 2000)
+    The workbook is parsed once with the Rust ``calamine`` engine, which
+    returns every sheet as a Polars frame without a pandas detour.
+
+    Parameters
+    ----------
+    excel_file : Path
+        Path to the Excel file.
+    output_dir : Path
+        Directory to save output parquet files.
+    variable_name : str
+        Name of the climate variable (Pe, ET0, ETc, IWR).
+    """
+    print(f"Processing {variable_name}...")
+
+    # Read all sheets in a single pass over the workbook
+    sheets = pl.read_excel(excel_file, sheet_id=0, engine="calamine")
+    all_data = [
+        _process_sheet(df_pl, sheet_name, variable_name)
+        for sheet_name, df_pl in sheets.items()
+    ]
+
+    # Concatenate all sheets and run the fused plan once
+    combined = pl.concat(all_data).sort(SORT_COLUMNS).collect(engine="streaming")
 
     # Save to parquet
     output_file = output_dir / f"{variable_name.lower()}_data.parquet"
-    combined.write_parquet(output_file)
+    _write_parquet(combined, output_file)
 
     print(f"  ✓ Saved to {output_file}")
     print(f"  ✓ Shape: {combined.shape}")
@@ -88,6 +145,16 @@ def process_excel_to_parquet(excel_file, output_dir, variable_name):
     return combined
 
 
+def _process_variable(job):
+    """
+    Process one ``(variable_name, excel_file, output_dir)`` job.
+
+    Defined at module level so it can be pickled into worker processes.
+    """
+    variable_name, excel_file, output_dir = job
+    return process_excel_to_parquet(excel_file, output_dir, variable_name)
+
+
 def main():
     """Main preprocessing function."""
     # Define paths (use absolute paths)
@@ -106,18 +173,20 @@ def main():
         "tas": data_dir / "tas_all.xlsx",  # Temperature data
     }
 
-    all_dataframes = []
-
-    for var_name, excel_file in variables.items():
-        df = process_excel_to_parquet(excel_file, output_dir, var_name)
-        all_dataframes.append(df)
+    # Variables are independent pipelines, so run them in separate processes;
+    # spawn, not fork: forking after Polars has started its thread pool can deadlock
+    jobs = [(name, path, output_dir) for name, path in variables.items()]
+    with ProcessPoolExecutor(
+        max_workers=len(jobs), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        all_dataframes = list(executor.map(_process_variable, jobs))
 
     # Combine all variables into one file
     print("\nCombining all variables...")
-    combined_all = pl.concat(all_dataframes)
+    combined_all = pl.concat(all_dataframes).sort(SORT_COLUMNS)
 
     output_combined = output_dir / "all_climate_data.parquet"
-    combined_all.write_parquet(output_combined)
+    _write_parquet(combined_all, output_combined)
 
     print(f"\n✓ Combined data saved to: {output_combined}")
     print(f"✓ Total shape: {combined_all.shape}")
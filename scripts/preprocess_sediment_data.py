@@ -35,11 +35,22 @@ def convert_sediment_to_parquet() -> None:
     sediment_output = output_dir / "sediment_load_historical.parquet"
     forest_output = output_dir / "forest_coverage_historical.parquet"
 
+    # Rows keep their Year order (the web export interpolates over it);
+    # ZSTD with statistics keeps the files small and prunable
+    write_options = dict(
+        compression="zstd",
+        compression_level=3,
+        statistics=True,
+        row_group_size=50_000,
+    )
+
     print(f"\nSaving sediment data to {sediment_output}...")
-    df_sediment.write_parquet(sediment_output)
+    df_sediment.with_columns(pl.col("Cate").cast(pl.Categorical)).write_parquet(
+        sediment_output, **write_options
+    )
 
     print(f"Saving forest data to {forest_output}...")
-    df_forest.write_parquet(forest_output)
+    df_forest.write_parquet(forest_output, **write_options)
 
     print("\n✓ Conversion completed successfully!")
     print(f"  - {sediment_output}")
@@ -6,12 +6,15 @@ This script performs the following steps:
 2) Convert TIME.csv into a canonical time vector Parquet (step, time)
 3) Read scenario_combinations3.xlsx and write scenarios.parquet
 4) For each variable CSV (except TIME), convert wide 4725x1905 to long Parquet
-   columns: scenario_name, step, value, variable
+   columns: scenario_id, step, value (rows clustered by scenario)
+5) For each variable, write index/{name}.parquet mapping scenario_id -> row group
+6) Write index/params.parquet: the scenario_ids matching each (parameter, value)
 
 Notes
 - Assumes each CSV has 4725 rows (scenarios) and 1905 columns (time steps)
-- Derives scenario_name as "sc_{row_index}"
-- Uses Polars lazy APIs to reduce memory pressure when possible
+- Keys scenarios by scenario_id (u32 row index); scenario_name "sc_{row_index}"
+  is kept only in scenarios.parquet for display
+- Melts each variable with numpy (one vectorized pass) and writes it to Parquet
 
 Run
     poetry run python scripts/preprocess_to_parquet.py \
@@ -25,10 +28,18 @@ from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import polars as pl
+import pyarrow.parquet as pq
+
+# Storage dtypes selectable for the long-table `value` column
+VALUE_DTYPES = {"f32": pl.Float32, "f64": pl.Float64}
 
 
 def parse_args() -> argparse.Namespace:
@@ -64,6 +75,31 @@ def parse_args() -> argparse.Namespace:
         choices=["zstd", "snappy", "lz4", "uncompressed"],
         help="Parquet compression codec",
     )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=3,
+        help="Compression level, applied only for zstd",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=50_000,
+        help="Maximum number of rows per Parquet row group (small groups prune well)",
+    )
+    parser.add_argument(
+        "--value-dtype",
+        type=str,
+        default="f32",
+        choices=sorted(VALUE_DTYPES),
+        help="Float width of the value column in variable files",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Variables converted in parallel (default: min(CPU count, variables))",
+    )
     return parser.parse_args()
 
 
@@ -109,6 +145,31 @@ def make_safe_name(name: str) -> str:
     return safe
 
 
+def parquet_write_options(
+    compression: str, compression_level: int, row_group_size: int
+) -> Dict[str, Any]:
+    """Build keyword arguments shared by every Parquet write in this script.
+
+    Statistics are always written so readers can prune row groups by min/max.
+
+    Args:
+        compression: Parquet compression codec
+        compression_level: Codec level, applied only for zstd
+        row_group_size: Maximum number of rows per row group
+
+    Returns:
+        Dict[str, Any]: Options for `write_parquet`
+    """
+    options: Dict[str, Any] = {
+        "compression": compression,
+        "statistics": True,
+        "row_group_size": row_group_size,
+    }
+    if compression == "zstd":
+        options["compression_level"] = compression_level
+    return options
+
+
 def ensure_out_dir(out_dir: Path) -> None:
     """Create output directory if missing.
 
@@ -118,7 +179,26 @@ def ensure_out_dir(out_dir: Path) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
 
 
-def build_time_parquet(data_dir: Path, out_dir: Path, compression: str) -> None:
+def csv_float_schema(csv_path: Path, dtype: pl.DataType) -> Dict[str, pl.DataType]:
+    """Build an explicit all-float schema from a wide CSV header.
+
+    Every column of the raw CSVs is numeric, so declaring the schema up front
+    skips Polars' dtype inference across the 1905 time-step columns.
+
+    Args:
+        csv_path: Path to the wide CSV file
+        dtype: Float dtype to parse every column as
+
+    Returns:
+        Dict[str, pl.DataType]: Column name -> dtype, in header order
+    """
+    header = pl.scan_csv(csv_path, glob=False, infer_schema=False).collect_schema()
+    return {name: dtype for name in header.names()}
+
+
+def build_time_parquet(
+    data_dir: Path, out_dir: Path, write_options: Dict[str, Any]
+) -> None:
     """Convert TIME.csv to time.parquet with columns [step, time].
 
     Notes:
@@ -128,30 +208,39 @@ def build_time_parquet(data_dir: Path, out_dir: Path, compression: str) -> None:
     Args:
         data_dir: Directory containing TIME.csv
         out_dir: Output directory for time.parquet
-        compression: Parquet compression codec
+        write_options: Parquet write options from `parquet_write_options`
     """
     time_csv = data_dir / "TIME.csv"
     if not time_csv.exists():
         raise FileNotFoundError(f"TIME.csv not found: {time_csv}")
 
     # Read first row only to build the time vector
-    time_row = pl.read_csv(time_csv, n_rows=1)
-    time_vec = time_row.transpose(
-        include_header=False, column_names=["time"]
-    ).with_row_index("step")
+    time_row = pl.read_csv(
+        time_csv, n_rows=1, schema=csv_float_schema(time_csv, pl.Float64)
+    )
+    time_vec = (
+        time_row.transpose(include_header=False, column_names=["time"]).with_row_index(
+            "step"
+        )
+        # 1905 steps fit in u16; must match the step dtype of variable files
+        .with_columns(pl.col("step").cast(pl.UInt16))
+    )
     (out_dir / "time.parquet").parent.mkdir(parents=True, exist_ok=True)
-    time_vec.write_parquet(out_dir / "time.parquet", compression=compression)
+    time_vec.write_parquet(out_dir / "time.parquet", **write_options)
 
 
-def build_scenarios_parquet(excel_path: Path, out_dir: Path, compression: str) -> None:
+def build_scenarios_parquet(
+    excel_path: Path, out_dir: Path, write_options: Dict[str, Any]
+) -> None:
     """Write scenarios.parquet from the Excel of scenario combinations.
 
-    Ensures `scenario_name` exists and is categorical.
+    Ensures `scenario_name` exists and is categorical, and adds the integer
+    `scenario_id` (row index) that variable files are keyed by.
 
     Args:
         excel_path: Path to scenario_combinations3.xlsx
         out_dir: Output directory
-        compression: Parquet compression codec
+        write_options: Parquet write options from `parquet_write_options`
     """
     if not excel_path.exists():
         raise FileNotFoundError(f"Excel not found: {excel_path}")
@@ -174,61 +263,182 @@ def build_scenarios_parquet(excel_path: Path, out_dir: Path, compression: str) -
             scenarios = scenarios.with_columns(pl.col(col).round(2))
 
     scenarios = scenarios.with_columns(pl.col("scenario_name").cast(pl.Categorical))
-    scenarios.write_parquet(out_dir / "scenarios.parquet", compression=compression)
+    if "scenario_id" not in scenarios.columns:
+        scenarios = scenarios.with_row_index("scenario_id")
+    scenarios.write_parquet(out_dir / "scenarios.parquet", **write_options)
+
 
+def build_param_index(out_dir: Path, write_options: Dict[str, Any]) -> None:
+    """Write index/params.parquet, an inverted index over scenario parameters.
 
-def wide_csv_to_long_df(csv_path: Path, variable: str) -> pl.DataFrame:
+    One row per (param, value) pair of every numeric parameter column, with the
+    list of matching `scenario_id`s. ScenarioQuery loads it as its filter masks
+    instead of scanning the parameter columns.
+
+    Args:
+        out_dir: Output directory holding scenarios.parquet
+        write_options: Parquet write options from `parquet_write_options`
+    """
+    scenarios = pl.read_parquet(out_dir / "scenarios.parquet")
+    params = [
+        c
+        for c, dtype in scenarios.schema.items()
+        if c not in ("scenario_id", "scenario_name") and dtype.is_numeric()
+    ]
+    index = (
+        scenarios.select(
+            pl.col("scenario_id").cast(pl.UInt32),
+            pl.col(params).cast(pl.Float64),
+        )
+        .unpivot(index="scenario_id", variable_name="param")
+        .group_by("param", "value", maintain_order=True)
+        .agg("scenario_id")
+    )
+    (out_dir / "index").mkdir(parents=True, exist_ok=True)
+    index.write_parquet(out_dir / "index" / "params.parquet", **write_options)
+
+
+def wide_csv_to_long_df(
+    csv_path: Path, variable: str, value_dtype: str = "f32"
+) -> pl.DataFrame:
     """Convert a wide CSV (rows=scenarios, cols=time steps) to a long DataFrame.
 
-    The resulting schema is: scenario_name: cat, step: u32, value: f32, variable: cat
+    The resulting schema is: scenario_id: u32, step: u16, value: f32|f64. The
+    variable name is carried by the file name, not a constant column.
 
     Args:
         csv_path: Path to the wide CSV file
-        variable: Variable name for the `variable` column
+        variable: Variable name (selects per-variable data corrections)
+        value_dtype: Key into VALUE_DTYPES for the `value` column (default f32)
 
     Returns:
         pl.DataFrame: Long-form frame suitable for writing to Parquet
     """
-    # Use file handle to avoid any glob interpretation on paths with [] characters
-    with csv_path.open("rb") as fh:
-        df = pl.read_csv(fh)
-    df = (
-        df.with_row_index("row_id")
-        .with_columns(pl.format("sc_{}", pl.col("row_id")).alias("scenario_name"))
-        .drop("row_id")
-    )
-    long_df = df.melt(
-        id_vars=["scenario_name"], variable_name="step", value_name="value"
-    )
-    
     # Apply data corrections based on variable name
     value_expr = pl.col("value")
+    parse_dtype = VALUE_DTYPES[value_dtype]
     if variable == "OA water demand province sum":
         # OA water demand has unit issues in raw data, multiply by 100
         value_expr = value_expr * 100
-    
-    long_df = long_df.with_columns(
-        pl.col("scenario_name").cast(pl.Categorical),
-        pl.col("step").cast(pl.UInt32),
-        value_expr.cast(pl.Float32),  # Use Float32 to reduce file size by ~50%
-        pl.lit(variable).alias("variable").cast(pl.Categorical),
+        # Scale in f64 and round to the storage dtype only once, on the final cast
+        parse_dtype = pl.Float64
+
+    # glob=False so paths with [] characters are taken literally; values are
+    # parsed straight into their dtype instead of being inferred
+    schema = csv_float_schema(csv_path, parse_dtype)
+    wide = pl.read_csv(csv_path, glob=False, schema=schema)
+
+    # A C-order ravel of the (scenario, step) matrix is already scenario-major,
+    # so the melt is three vectorized array fills rather than unpivot + sort.
+    # Scenario-major order lets each row group cover a narrow scenario range
+    values = wide.to_numpy(order="c")
+    n_scenarios, n_steps = values.shape
+    value = pl.Series("value", values.ravel())
+    if wide.null_count().sum_horizontal().item() > 0:
+        # to_numpy turned empty cells into NaN; null exactly those cells again
+        # so NaN values present in the CSV stay NaN
+        empty = wide.select(pl.all().is_null()).to_numpy(order="c").ravel()
+        value = value.scatter(np.flatnonzero(empty), None)
+    long = pl.DataFrame(
+        {
+            "scenario_id": np.repeat(np.arange(n_scenarios, dtype=np.uint32), n_steps),
+            "step": np.tile(np.arange(n_steps, dtype=np.uint16), n_scenarios),
+            "value": value,
+        }
+    )
+
+    return long.with_columns(
+        # f32 halves value bytes; simulation output has no more precision than that
+        value_expr.cast(VALUE_DTYPES[value_dtype]),
+    )
+
+
+def build_row_group_index(parquet_file: Path, index_file: Path) -> None:
+    """Write a sidecar mapping each scenario_id to the row groups that hold it.
+
+    Rows are clustered by scenario, so each row group covers the contiguous id
+    range given by its scenario_id min/max statistics.
+
+    Args:
+        parquet_file: Variable Parquet file written by `_convert_one`
+        index_file: Destination of the (scenario_id, row_group) table
+    """
+    meta = pq.ParquetFile(parquet_file).metadata
+    col = meta.schema.names.index("scenario_id")
+    bounds = [
+        meta.row_group(i).column(col).statistics for i in range(meta.num_row_groups)
+    ]
+    index = (
+        pl.DataFrame(
+            {
+                "row_group": range(meta.num_row_groups),
+                "lo": [b.min for b in bounds],
+                "hi": [b.max for b in bounds],
+            },
+            schema={"row_group": pl.UInt32, "lo": pl.UInt32, "hi": pl.UInt32},
+        )
+        .select(
+            pl.int_ranges("lo", pl.col("hi") + 1, dtype=pl.UInt32).alias("scenario_id"),
+            "row_group",
+        )
+        .explode("scenario_id")
     )
-    return long_df
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    index.write_parquet(index_file, statistics=True)
+
+
+def _init_worker(n_threads: int) -> None:
+    """Cap the Polars thread pool of a worker before it does any Polars work.
+
+    Args:
+        n_threads: Number of Polars threads for this worker
+    """
+    os.environ["POLARS_MAX_THREADS"] = str(n_threads)
+
+
+def _convert_one(
+    csv_path: Path,
+    variable_name: str,
+    out_file: Path,
+    write_options: Dict[str, Any],
+    value_dtype: str,
+) -> None:
+    """Convert one variable CSV to a Parquet long table (runs in a worker process).
+
+    Args:
+        csv_path: Path to the wide CSV file
+        variable_name: Original variable name (used for data corrections)
+        out_file: Destination Parquet file
+        write_options: Parquet write options from `parquet_write_options`
+        value_dtype: Key into VALUE_DTYPES for the `value` column
+    """
+    print(f"[INFO] Converting {variable_name} <- {csv_path.name}", flush=True)
+    long_df = wide_csv_to_long_df(csv_path, variable_name, value_dtype)
+    long_df.write_parquet(out_file, **write_options)
+    build_row_group_index(out_file, out_file.parent / "index" / out_file.name)
 
 
 def process_variables_to_parquet(
     data_dir: Path,
     out_dir: Path,
     variables: Iterable[Tuple[str, str]],
-    compression: str,
+    write_options: Dict[str, Any],
+    value_dtype: str = "f32",
+    max_workers: Optional[int] = None,
 ) -> None:
     """Process each variable CSV to Parquet long tables.
 
+    Variables are independent, so each is converted in its own process. The
+    cores are split between workers via POLARS_MAX_THREADS to avoid
+    oversubscription.
+
     Args:
         data_dir: Input data directory containing CSV files
         out_dir: Output directory for Parquet files
         variables: Iterable of (variable_name, filename) pairs
-        compression: Parquet compression codec
+        write_options: Parquet write options from `parquet_write_options`
+        value_dtype: Key into VALUE_DTYPES for the `value` column
+        max_workers: Worker processes (default: min(CPU count, number of variables))
     """
     # Build mapping original_name -> safe_name and write to variables_map.json
     variables_map: Dict[str, str] = {}
@@ -240,6 +450,7 @@ def process_variables_to_parquet(
         json.dumps(variables_map, ensure_ascii=False, indent=2), encoding="utf-8"
     )
 
+    jobs: List[Tuple[Path, str, Path]] = []
     for variable_name, filename in variables:
         if variable_name == "TIME":
             # TIME handled separately
@@ -248,13 +459,36 @@ def process_variables_to_parquet(
         if not csv_path.exists():
             print(f"[WARN] Missing CSV for variable '{variable_name}': {csv_path}")
             continue
-        print(f"[INFO] Converting {variable_name} <- {csv_path.name}")
-        long_df = wide_csv_to_long_df(csv_path, variable_name)
-        # Write Parquet
         safe_name = variables_map.get(variable_name, make_safe_name(variable_name))
         out_file = out_dir / f"{safe_name}.parquet"
         out_file.parent.mkdir(parents=True, exist_ok=True)
-        long_df.write_parquet(out_file, compression=compression)
+        jobs.append((csv_path, variable_name, out_file))
+    if not jobs:
+        return
+
+    total_cores = os.cpu_count() or 1
+    workers = max(1, min(max_workers or total_cores, len(jobs)))
+    # spawn, not fork: forking after Polars has started its thread pool can deadlock
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(max(1, total_cores // workers),),
+    ) as executor:
+        futures = {
+            executor.submit(
+                _convert_one,
+                csv_path,
+                variable_name,
+                out_file,
+                write_options,
+                value_dtype,
+            ): variable_name
+            for csv_path, variable_name, out_file in jobs
+        }
+        for future in as_completed(futures):
+            future.result()  # Re-raise worker errors
+            print(f"[INFO] Wrote {futures[future]}")
 
 
 def main() -> None:
@@ -262,7 +496,9 @@ def main() -> None:
     args = parse_args()
     data_dir: Path = args.data_dir
     out_dir: Path = args.out_dir
-    compression: str = args.compression
+    write_options = parquet_write_options(
+        args.compression, args.compression_level, args.row_group_size
+    )
 
     ensure_out_dir(out_dir)
 
@@ -270,13 +506,16 @@ def main() -> None:
     variables, _meta = read_metadata(data_dir / "metadata.json")
 
     # TIME vector
-    build_time_parquet(data_dir, out_dir, compression)
+    build_time_parquet(data_dir, out_dir, write_options)
 
     # Scenarios
-    build_scenarios_parquet(args.excel, out_dir, compression)
+    build_scenarios_parquet(args.excel, out_dir, write_options)
+    build_param_index(out_dir, write_options)
 
     # Variables (excluding TIME)
-    process_variables_to_parquet(data_dir, out_dir, variables, compression)
+    process_variables_to_parquet(
+        data_dir, out_dir, variables, write_options, args.value_dtype, args.max_workers
+    )
 
     print(f"[DONE] Parquet dataset written to: {out_dir}")
 
@@ -43,13 +43,65 @@ Google-style docstrings are used throughout.
 
 from __future__ import annotations
 
-import hashlib
 import json
+import os
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Read via the row-group index only when a query touches at most this share of
+# a variable file's row groups; beyond that a full scan is faster
+ROW_GROUP_READ_FRACTION = 0.25
+
+# get_series_wide builds columns one filter at a time up to this many distinct
+# pivot values; wider results (e.g. one column per scenario) use pivot
+WIDE_LOOP_MAX_COLUMNS = 16
+
+# Threads used to pre-compute the default scenario cache at startup
+WARMUP_WORKERS = 4
+
+# Variables the dashboards, API and report notebooks query by default; their
+# all-scenario results are pre-computed (or prebuilt) at startup
+DEFAULT_CACHE_VARIABLES = (
+    "YRB WSI",
+    "YRB available surface water",
+    "irrigation water demand province sum",
+    "production water demand province sum",
+    "OA water demand province sum",
+    "domestic water demand province sum",
+    "water consumption of province in YRB sum",
+    "Total population",
+)
+
+
+@lru_cache(maxsize=16)
+def _read_arrow_table(path: str, mtime_ns: int) -> pa.Table:
+    """Memory-map a small Parquet file as an Arrow table shared per process.
+
+    Keyed by modification time so a rewritten file is read again; every
+    ScenarioQuery built on the same file reuses one set of mapped pages.
+
+    Args:
+        path: Parquet file path
+        mtime_ns: Modification time of the file (part of the cache key)
+
+    Returns:
+        The file contents as an Arrow table.
+    """
+    return pq.read_table(path, memory_map=True)
+
+
+def _read_shared_parquet(path: Path) -> pl.DataFrame:
+    """Return a Polars view over the shared, memory-mapped table for ``path``."""
+    return pl.from_arrow(_read_arrow_table(str(path), path.stat().st_mtime_ns))
 
 
 class ScenarioQuery:
@@ -65,23 +117,80 @@ class ScenarioQuery:
         self,
         data_dir: Union[str, Path] = "data_parquet",
         cache_dir: Optional[Path] = None,
+        var_cache_max_bytes: int = 1 << 30,
     ):
         """Initialize query engine and load metadata.
 
         Args:
             data_dir: Path to Parquet data directory (default: "data_parquet")
             cache_dir: Optional path to cache directory (defaults to data_dir/cache)
+            var_cache_max_bytes: Memory budget for fully loaded variable frames
+                (default: 1 GiB; 0 disables the cache)
         """
         self.data_dir = Path(data_dir)
         if not self.data_dir.exists():
             raise FileNotFoundError(f"Data directory not found: {self.data_dir}")
 
-        # Load and cache metadata
-        self.scenarios = pl.read_parquet(self.data_dir / "scenarios.parquet")
-        self.time = pl.read_parquet(self.data_dir / "time.parquet")
+        # Load and cache metadata (memory-mapped, shared across instances)
+        self.scenarios = _read_shared_parquet(self.data_dir / "scenarios.parquet")
+        self.time = _read_shared_parquet(self.data_dir / "time.parquet")
+        # time.parquet normally holds every step 0..n-1, so time is looked up
+        # by position; a sparse step column falls back to a join on step
+        time_by_step = self.time.sort("step")
+        self.time_values = time_by_step.get_column("time")
+        self._steps_dense = time_by_step.get_column("step").equals(
+            pl.int_range(time_by_step.height, eager=True), check_dtypes=False
+        )
+        self._time_ascending = self._steps_dense and self.time_values.is_sorted()
+        if "scenario_id" not in self.scenarios.columns:
+            # Older datasets: scenario_name is "sc_{row_index}", so the id is the row
+            self.scenarios = self.scenarios.with_row_index("scenario_id")
+        if self.scenarios.schema["scenario_name"] == pl.String:
+            # Categorical names compare and join as integer codes, not strings
+            self.scenarios = self.scenarios.with_columns(
+                pl.col("scenario_name").cast(pl.Categorical)
+            )
+        # scenario_id is normally the row index, so scenario columns can be
+        # attached to variable rows by position instead of a join
+        self._ids_dense = self.scenarios.get_column("scenario_id").equals(
+            pl.int_range(self.scenarios.height, eager=True), check_dtypes=False
+        )
+
+        # Extract parameter columns (all except the scenario keys)
+        self.param_cols = [
+            c
+            for c in self.scenarios.columns
+            if c not in ("scenario_id", "scenario_name")
+        ]
 
-        # Extract parameter columns (all except scenario_name)
-        self.param_cols = [c for c in self.scenarios.columns if c != "scenario_name"]
+        # Integer switches (1/2/3) fit in Int8, which narrows the include_params
+        # join. Float parameters stay Float64: as float32, 1.6 would no longer
+        # equal the 1.6 users filter on and get back
+        self.scenarios = self.scenarios.with_columns(
+            self.scenarios.get_column(c).shrink_dtype()
+            for c in self.param_cols
+            if self.scenarios.schema[c].is_integer()
+        )
+
+        # Parameter columns as contiguous numpy arrays: filtering and summaries
+        # index these directly instead of going through a Polars frame
+        self._param_arrays: Dict[str, np.ndarray] = {
+            param: self.scenarios.get_column(param).to_numpy()
+            for param in self.param_cols
+        }
+
+        # Inverted index: parameter -> value -> boolean row mask over scenarios.
+        # Dense masks beat sorted id arrays here: union/intersection is one
+        # vectorized OR/AND over 9450 bytes instead of a sort-based set op
+        self._by_param = self._build_param_index()
+
+        # Sorted levels of each numeric parameter, used to resolve filter values
+        # that differ from a stored level only by float rounding
+        self._param_levels: Dict[str, np.ndarray] = {
+            param: np.sort(np.fromiter(index, dtype=np.float64, count=len(index)))
+            for param, index in self._by_param.items()
+            if self._param_arrays[param].dtype.kind in "iuf"
+        }
 
         # Load variable name mapping (original -> safe)
         self.variables_map_path = self.data_dir / "variables_map.json"
@@ -90,53 +199,121 @@ class ScenarioQuery:
             self.variables_map = json.loads(
                 self.variables_map_path.read_text(encoding="utf-8")
             )
+        self._original_names = {v: k for k, v in self.variables_map.items()}
+
+        # One directory scan and footer read per file at startup, shared by
+        # list_variables and the default cache warmup
+        self._variable_files, self._scenario_variables = self._scan_variable_files()
 
         # Setup cache (skip directory creation in Docker environment)
-        self.cache_dir = cache_dir or (self.data_dir / "cache")
+        self.cache_dir = Path(cache_dir) if cache_dir else self.data_dir / "cache"
         # Skip directory creation in Docker environment (read-only filesystem)
         # self.cache_dir.mkdir(exist_ok=True)
 
         # In-memory cache for frequently accessed queries
-        self.query_cache: Dict[str, pl.DataFrame] = {}
+        self.query_cache: OrderedDict[Tuple, pl.DataFrame] = OrderedDict()
         self.cache_max_size = 100  # Maximum number of cached queries
         self._cache_lock = threading.Lock()  # Thread safety for cache operations
 
+        # LRU of fully loaded variable frames, keyed by (path, mtime) and bounded
+        # by estimated size, so repeated broad queries filter in memory
+        self._var_cache: OrderedDict[Tuple[str, int], pl.DataFrame] = OrderedDict()
+        self._var_cache_bytes = 0
+        self._var_cache_max_bytes = var_cache_max_bytes
+        self._var_cache_lock = threading.Lock()
+
+        # LRU of filter_scenarios results: the same parameter filters recur
+        # across variables, warmup and API calls
+        self._filter_memo: OrderedDict[frozenset, pl.DataFrame] = OrderedDict()
+        self._filter_memo_max_size = 256
+        self._filter_memo_lock = threading.Lock()
+
         # Pre-computed default scenario cache
-        self.default_scenario_cache: Dict[str, pl.DataFrame] = {}
+        self.default_scenario_cache: Dict[str, pl.LazyFrame] = {}
 
         # Initialize default scenario cache
         self._initialize_default_cache()
 
+    def _build_param_index(self) -> Dict[str, Dict[Any, np.ndarray]]:
+        """Build the parameter -> value -> row mask index for filter_scenarios.
+
+        Masks are read from ``index/params.parquet`` (written by the
+        preprocessing script) when it is at least as new as scenarios.parquet.
+        Parameters it does not cover are indexed from the scenario columns.
+
+        Returns:
+            Nested dict of boolean masks aligned with ``self.scenarios`` rows.
+        """
+        n_scenarios = self.scenarios.height
+        by_param: Dict[str, Dict[Any, np.ndarray]] = {}
+
+        index_file = self.data_dir / "index" / "params.parquet"
+        scenarios_file = self.data_dir / "scenarios.parquet"
+        if (
+            index_file.exists()
+            and index_file.stat().st_mtime_ns >= scenarios_file.stat().st_mtime_ns
+        ):
+            table = pq.read_table(index_file)
+            id_lists = table.column("scenario_id").combine_chunks()
+            offsets = id_lists.offsets.to_numpy()
+            offsets = offsets - offsets[0]
+            ids = id_lists.flatten().to_numpy()
+            if ids.size == 0 or ids.max() < n_scenarios:
+                pairs = zip(
+                    table.column("param").to_pylist(), table.column("value").to_pylist()
+                )
+                for i, (param, value) in enumerate(pairs):
+                    if param not in self.param_cols:
+                        continue
+                    mask = np.zeros(n_scenarios, dtype=bool)
+                    mask[ids[offsets[i] : offsets[i + 1]]] = True
+                    by_param.setdefault(param, {})[value] = mask
+
+        for param in self.param_cols:
+            if param in by_param:
+                continue
+            values = self._param_arrays[param]
+            by_param[param] = {
+                value: values == value for value in np.unique(values).tolist()
+            }
+        return by_param
+
     def _generate_cache_key(
         self,
         variables: Union[str, List[str]],
         filters: Optional[Dict],
         time_range: Optional[Tuple[float, float]],
-    ) -> str:
+        include_params: bool = False,
+    ) -> Tuple:
         """Generate a unique cache key for a query.
 
         Args:
             variables: Variable name(s) to query
             filters: Parameter filters
             time_range: Time range tuple
+            include_params: Whether the result carries parameter columns
 
         Returns:
-            Unique string key for caching
+            Hashable tuple key for caching
         """
         # Normalize variables to list
         if isinstance(variables, str):
             variables = [variables]
 
-        # Create a deterministic key
-        key_data = {
-            "variables": sorted(variables),
-            "filters": filters or {},
-            "time_range": time_range,
-        }
-
-        # Convert to JSON string and hash
-        key_str = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_str.encode()).hexdigest()
+        # The normalized tuple is itself the dict key: no JSON encoding or
+        # digest on every get_series call
+        filter_items = tuple(
+            sorted(
+                (param, tuple(value) if isinstance(value, (list, tuple)) else value)
+                for param, value in (filters or {}).items()
+            )
+        )
+        return (
+            tuple(sorted(variables)),
+            filter_items,
+            tuple(time_range) if time_range else None,
+            include_params,
+        )
 
     def _is_default_scenario(self, filters: Optional[Dict]) -> bool:
         """Check if filters represent the default scenario (all parameters Any/null).
@@ -157,43 +334,119 @@ class ScenarioQuery:
 
         return True
 
+    def _scan_variable_files(self) -> Tuple[Dict[str, Path], List[str]]:
+        """Find the variable files in the data directory.
+
+        Returns:
+            Mapping of original variable name -> file for every variable file,
+            and the names of those keyed by scenario (in file name order).
+        """
+        variable_files: Dict[str, Path] = {}
+        scenario_variables: List[str] = []
+        for file_path in sorted(self.data_dir.glob("*.parquet")):
+            if file_path.name in ["scenarios.parquet", "time.parquet"]:
+                continue
+            var_name = file_path.stem
+            # Convert safe name back to original if possible
+            name = self._original_names.get(var_name, var_name)
+            variable_files[name] = file_path
+
+            # Check if this file has a scenario key column (scenario-based
+            # data); only the footer is read, not the row groups
+            try:
+                columns = pq.read_schema(file_path).names
+            except Exception as e:
+                print(f"  ⚠️  Skipping {var_name}: {e}")
+                continue
+            if "scenario_id" in columns or "scenario_name" in columns:
+                scenario_variables.append(name)
+        return variable_files, scenario_variables
+
+    def _default_cache_variables(self) -> List[Tuple[str, Path]]:
+        """List the scenario variables whose default result is precomputed.
+
+        Returns:
+            (original name, variable file) pairs for the DEFAULT_CACHE_VARIABLES
+            present in this dataset.
+        """
+        return [
+            (var, self._variable_files[var])
+            for var in DEFAULT_CACHE_VARIABLES
+            if var in self._scenario_variables
+        ]
+
+    def _default_cache_file(self, var_file: Path) -> Path:
+        """Path of the prebuilt default result for a variable file."""
+        return self.cache_dir / f"default_{var_file.stem}.parquet"
+
+    def _scan_default_cache(self, var_file: Path) -> Optional[pl.LazyFrame]:
+        """Lazily scan a prebuilt default result if it is newer than its inputs.
+
+        Args:
+            var_file: Variable Parquet file the result was computed from
+
+        Returns:
+            A scan of the stored result, or None if missing or stale.
+        """
+        cache_file = self._default_cache_file(var_file)
+        if not cache_file.exists():
+            return None
+        inputs = (var_file, self.data_dir / "scenarios.parquet")
+        built = cache_file.stat().st_mtime_ns
+        if any(path.stat().st_mtime_ns > built for path in inputs):
+            return None
+        return pl.scan_parquet(cache_file)
+
+    def build_default_cache(self) -> List[Path]:
+        """Write the default scenario results to ``cache_dir`` for fast startup.
+
+        Run once after preprocessing (``--build-default-cache``); later
+        instances read these files instead of recomputing the results.
+
+        Returns:
+            Paths of the written files.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for var, var_file in self._default_cache_variables():
+            result = self._compute_series(var, None, None, include_params=True)
+            cache_file = self._default_cache_file(var_file)
+            result.write_parquet(cache_file, compression="lz4")
+            written.append(cache_file)
+        return written
+
     def _initialize_default_cache(self):
         """Pre-compute results for default scenarios (all parameters Any).
 
         This pre-computes the most common query pattern to improve performance.
+        Entries are LazyFrames: results written by ``build_default_cache`` are
+        only scanned here (decoded on first hit, with any time filter pushed
+        into the scan), and computed results are held in memory.
         """
         print("🔄 Initializing default scenario cache...")
 
-        # Get list of available variables that have scenario_name column
-        available_vars = []
-        for file_path in self.data_dir.glob("*.parquet"):
-            if file_path.name not in ["scenarios.parquet", "time.parquet"]:
-                var_name = file_path.stem
-
-                # Check if this file has scenario_name column (scenario-based data)
-                try:
-                    df = pl.read_parquet(file_path)
-                    if "scenario_name" in df.columns:
-                        # Convert safe name back to original if possible
-                        original_name = next(
-                            (k for k, v in self.variables_map.items() if v == var_name),
-                            var_name,
-                        )
-                        available_vars.append(original_name)
-                except Exception as e:
-                    print(f"  ⚠️  Skipping {var_name}: {e}")
-                    continue
-
-        # Pre-compute default scenario for each variable
-        for var in available_vars[
-            :10
-        ]:  # Limit to first 10 variables to avoid long startup
+        def compute(item: Tuple[str, Path]) -> Optional[pl.LazyFrame]:
+            var, var_file = item
             try:
+                result = self._scan_default_cache(var_file)
+                if result is not None:
+                    return result
                 print(f"  📊 Pre-computing default scenario for {var}...")
-                result = self._compute_series(var, None, None, include_params=True)
-                self.default_scenario_cache[var] = result
+                return self._compute_series(var, None, None, include_params=True).lazy()
             except Exception as e:
                 print(f"  ⚠️  Failed to pre-compute {var}: {e}")
+                return None
+
+        # Pre-compute default scenario for each variable. Files are independent
+        # and Polars releases the GIL while decoding, so on multi-core hosts a
+        # few threads overlap the reads; the pool stays small to bound memory
+        variables = self._default_cache_variables()
+        n_workers = min(WARMUP_WORKERS, os.cpu_count() or 1, len(variables))
+        if variables:
+            with ThreadPoolExecutor(max_workers=n_workers) as ex:
+                for (var, _), result in zip(variables, ex.map(compute, variables)):
+                    if result is not None:
+                        self.default_scenario_cache[var] = result
 
         print(
             f"✅ Default cache initialized with {len(self.default_scenario_cache)} variables"
@@ -210,7 +463,9 @@ class ScenarioQuery:
                      - List: match any value (e.g., {"Climate scenario": [1, 2]})
 
         Returns:
-            DataFrame of matching scenarios with all parameter columns.
+            DataFrame of matching scenarios with scenario_id, scenario_name and
+            all parameter columns. Results are memoized per filter set, so the
+            frame may be shared between callers.
 
         Example:
             >>> query = ScenarioQuery()
@@ -218,23 +473,287 @@ class ScenarioQuery:
             ...     "Fertility Variation": 1.6,
             ...     "Climate change scenario switch for water yield": [1, 2]
             ... })
-            >>> print(filtered.shape)  # (N_matching_scenarios, N_params+1)
+            >>> print(filtered.shape)  # (N_matching_scenarios, N_params+2)
         """
-        df = self.scenarios
+        if not filters:
+            return self.scenarios
+
+        key = frozenset(
+            (param, tuple(value) if isinstance(value, (list, tuple)) else value)
+            for param, value in filters.items()
+        )
+        with self._filter_memo_lock:
+            filtered = self._filter_memo.get(key)
+            if filtered is not None:
+                self._filter_memo.move_to_end(key)
+                return filtered
+
+        # Row-index take is cheaper than a boolean filter over every column
+        filtered = self.scenarios[np.flatnonzero(self._scenario_mask(filters))]
+        with self._filter_memo_lock:
+            self._filter_memo[key] = filtered
+            if len(self._filter_memo) > self._filter_memo_max_size:
+                self._filter_memo.popitem(last=False)
+        return filtered
+
+    def _scenario_mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Evaluate parameter filters to a boolean mask over scenario rows.
+
+        Args:
+            filters: Parameter constraints as accepted by ``filter_scenarios``
 
+        Returns:
+            Boolean array aligned with ``self.scenarios`` rows.
+
+        Raises:
+            ValueError: If a filter names an unknown parameter.
+        """
+        # OR the masks within a list-valued filter, AND across parameters
+        mask = np.ones(self.scenarios.height, dtype=bool)
         for param, value in filters.items():
             if param not in self.param_cols:
                 raise ValueError(
                     f"Unknown parameter: {param}. Available: {self.param_cols}"
                 )
 
-            if isinstance(value, (list, tuple)):
-                df = df.filter(pl.col(param).is_in(value))
-            else:
-                df = df.filter(pl.col(param) == value)
+            index = self._by_param[param]
+            values = value if isinstance(value, (list, tuple)) else [value]
+            param_mask = np.zeros_like(mask)
+            for v in values:
+                level_mask = index.get(v)
+                if level_mask is None:
+                    level_mask = index.get(self._snap_to_level(param, v))
+                if level_mask is not None:
+                    param_mask |= level_mask
+            mask &= param_mask
+        return mask
+
+    def _snap_to_level(self, param: str, value: Any) -> Any:
+        """Map a numeric filter value to the stored level it is float-equal to.
+
+        Values that arrive through JSON, sliders or arithmetic (``0.1 * 16``)
+        can differ from the stored level in the last bits, which an exact
+        lookup would silently treat as "no match".
+
+        Args:
+            param: Parameter name
+            value: Filter value with no exact match in the index
+
+        Returns:
+            The matching stored level, or ``value`` unchanged if none is close.
+        """
+        levels = self._param_levels.get(param)
+        if levels is None or isinstance(value, bool):
+            return value
+        try:
+            target = float(value)
+        except (TypeError, ValueError):
+            return value
+        i = int(np.searchsorted(levels, target))
+        for j in (i - 1, i):
+            if 0 <= j < levels.size and np.isclose(
+                levels[j], target, rtol=1e-9, atol=1e-12
+            ):
+                return levels[j].item()
+        return value
+
+    def _scan_variables(
+        self, var_files: Dict[str, Path], scenarios: pl.DataFrame
+    ) -> pl.LazyFrame:
+        """Lazily scan one or more variable files restricted to the given scenarios.
+
+        Variable files carry no ``variable`` column (the file name is the
+        variable); it is added here only when several variables are combined.
+
+        When none of several files is held in the variable cache or has a
+        row-group index, and they all share one layout, they are read by a
+        single multi-file ``scan_parquet`` so Polars schedules the reads in
+        parallel. Otherwise each file goes through ``_scan_variable`` and the
+        frames are concatenated lazily.
+
+        Args:
+            var_files: Variable name -> path of its Parquet file
+            scenarios: Scenarios to keep (with scenario_id and scenario_name)
 
+        Returns:
+            LazyFrame with scenario_id, step and value columns, plus a
+            categorical variable column when more than one file is scanned.
+        """
+        if len(var_files) == 1:
+            (var_file,) = var_files.values()
+            return self._scan_variable(var_file, scenarios)
+
+        with self._var_cache_lock:
+            cached = {path for path, _ in self._var_cache}
+        cold = not any(
+            str(f) in cached or (f.parent / "index" / f.name).exists()
+            for f in var_files.values()
+        )
+        # Older files still hold a constant variable column; it is replaced below
+        schemas = {
+            tuple(
+                (c, t) for c, t in pl.read_parquet_schema(f).items() if c != "variable"
+            )
+            for f in var_files.values()
+        }
+        if cold and len(schemas) == 1:
+            names = {str(f): var for var, f in var_files.items()}
+            lf = pl.scan_parquet(list(var_files.values()), include_file_paths="path")
+            lf = self._filter_scenarios(lf, dict(schemas.pop()), scenarios)
+            return lf.select(
+                pl.exclude("path", "variable"),
+                pl.col("path")
+                .replace_strict(names, return_dtype=pl.Categorical)
+                .alias("variable"),
+            )
+
+        # Relaxed union: files from different builds may store step as u16 or
+        # u32 and value as f32 or f64; they are widened to a common type
+        return pl.concat(
+            [
+                self._scan_variable(f, scenarios).with_columns(
+                    pl.lit(var).cast(pl.Categorical).alias("variable")
+                )
+                for var, f in var_files.items()
+            ],
+            how="vertical_relaxed",
+        )
+
+    def _scan_variable(self, var_file: Path, scenarios: pl.DataFrame) -> pl.LazyFrame:
+        """Lazily scan a variable file restricted to the given scenarios.
+
+        Args:
+            var_file: Path to the variable Parquet file
+            scenarios: Scenarios to keep (with scenario_id and scenario_name)
+
+        Returns:
+            LazyFrame with scenario_id, step and value columns.
+        """
+        schema = pl.read_parquet_schema(var_file)
+        if "scenario_id" in schema:
+            scenario_ids = scenarios.get_column("scenario_id")
+            selected = self._read_indexed_row_groups(var_file, scenario_ids)
+            if selected is not None:
+                return selected
+
+        lf = self._load_variable(var_file).lazy()
+        return self._filter_scenarios(lf, schema, scenarios).select(
+            pl.exclude("variable")
+        )
+
+    @staticmethod
+    def _filter_scenarios(
+        lf: pl.LazyFrame, schema: Dict[str, pl.DataType], scenarios: pl.DataFrame
+    ) -> pl.LazyFrame:
+        """Keep the rows of the given scenarios in a variable frame.
+
+        Variable files are keyed by the integer ``scenario_id``. Files written
+        before that column existed only carry ``scenario_name``; those are
+        filtered by name and mapped to ids through the scenarios table.
+
+        Args:
+            lf: Variable rows to filter
+            schema: Schema of the variable file(s) behind ``lf``
+            scenarios: Scenarios to keep (with scenario_id and scenario_name)
+
+        Returns:
+            LazyFrame keyed by scenario_id with the remaining columns of ``lf``.
+        """
+        # Keys stay native Series (no Python list round-trip); implode() makes
+        # is_in treat the whole Series as the lookup set
+        if "scenario_id" in schema:
+            scenario_ids = scenarios.get_column("scenario_id")
+            return lf.filter(pl.col("scenario_id").is_in(scenario_ids.implode()))
+
+        # Match the file's key dtype (Categorical, or String in some older files)
+        # so the join keys agree
+        name_dtype = schema["scenario_name"]
+        scenario_names = scenarios.get_column("scenario_name").cast(name_dtype)
+        keys = scenarios.lazy().select(
+            pl.col("scenario_name").cast(name_dtype), "scenario_id"
+        )
+        return (
+            lf.filter(pl.col("scenario_name").is_in(scenario_names.implode()))
+            .join(keys, on="scenario_name", how="left")
+            .select("scenario_id", pl.exclude("scenario_id", "scenario_name"))
+        )
+
+    def _load_variable(self, var_file: Path) -> pl.DataFrame:
+        """Return a fully loaded variable frame, reusing the in-memory LRU.
+
+        Entries are keyed by path and modification time, so a rewritten file is
+        reloaded. The least recently used frames are evicted once the estimated
+        size of the cache exceeds ``var_cache_max_bytes``.
+
+        Args:
+            var_file: Path to the variable Parquet file
+
+        Returns:
+            The whole variable table.
+        """
+        key = (str(var_file), var_file.stat().st_mtime_ns)
+        with self._var_cache_lock:
+            if key in self._var_cache:
+                self._var_cache.move_to_end(key)
+                return self._var_cache[key]
+
+        df = pl.read_parquet(var_file, memory_map=True)
+        size = df.estimated_size()
+        if size > self._var_cache_max_bytes:
+            return df
+
+        with self._var_cache_lock:
+            if key not in self._var_cache:
+                self._var_cache[key] = df
+                self._var_cache_bytes += size
+            while self._var_cache_bytes > self._var_cache_max_bytes:
+                _, evicted = self._var_cache.popitem(last=False)
+                self._var_cache_bytes -= evicted.estimated_size()
         return df
 
+    def _read_indexed_row_groups(
+        self, var_file: Path, scenario_ids: pl.Series
+    ) -> Optional[pl.LazyFrame]:
+        """Read only the row groups holding the given scenarios.
+
+        Uses the ``index/{variable}.parquet`` sidecar (scenario_id -> row_group)
+        written by the preprocessing script.
+
+        Args:
+            var_file: Path to the variable Parquet file
+            scenario_ids: Scenario ids to keep
+
+        Returns:
+            LazyFrame of scenario_id, step and value for the selected rows, or
+            None when the file has no index or the query touches too many row
+            groups for random reads to pay off.
+        """
+        index_file = var_file.parent / "index" / var_file.name
+        if not index_file.exists():
+            return None
+
+        index = pl.read_parquet(index_file)
+        row_groups = (
+            index.filter(pl.col("scenario_id").is_in(scenario_ids.implode()))
+            .get_column("row_group")
+            .unique()
+            .sort()
+        )
+        n_row_groups = index.get_column("row_group").max() + 1
+        if row_groups.len() > ROW_GROUP_READ_FRACTION * n_row_groups:
+            return None
+
+        # Project to the key and data columns; files written before the
+        # variable column was dropped would otherwise decode it for nothing
+        table = pq.ParquetFile(var_file).read_row_groups(
+            row_groups.to_list(), columns=["scenario_id", "step", "value"]
+        )
+        return (
+            pl.from_arrow(table)
+            .lazy()
+            .filter(pl.col("scenario_id").is_in(scenario_ids.implode()))
+        )
+
     def _compute_series(
         self,
         variables: Union[str, List[str]],
@@ -250,54 +769,86 @@ class ScenarioQuery:
             variables = [variables]
 
         # Filter scenarios first
-        if filters:
-            scenarios = self.filter_scenarios(filters)
-            scenario_names = scenarios.get_column("scenario_name").to_list()
-        else:
-            scenarios = self.scenarios
-            scenario_names = scenarios.get_column("scenario_name").to_list()
+        scenarios = self.filter_scenarios(filters) if filters else self.scenarios
 
         # Limit number of scenarios to prevent memory issues
         MAX_SCENARIOS = 1000
-        if len(scenario_names) > MAX_SCENARIOS:
+        if scenarios.height > MAX_SCENARIOS:
             print(
-                f"⚠️  Warning: Query matches {len(scenario_names)} scenarios, limiting to {MAX_SCENARIOS}"
+                f"⚠️  Warning: Query matches {scenarios.height} scenarios, limiting to {MAX_SCENARIOS}"
             )
-            scenario_names = scenario_names[:MAX_SCENARIOS]
+            scenarios = scenarios.head(MAX_SCENARIOS)
 
-        # Load and concatenate variable data
-        dfs = []
+        # Build one lazy plan: scan -> union -> time join -> params join
+        var_files: Dict[str, Path] = {}
         for var in variables:
             # Support original name or safe name
             safe = self.variables_map.get(var, var)
             var_file = self.data_dir / f"{safe}.parquet"
             if not var_file.exists():
                 raise FileNotFoundError(f"Variable file not found: {var_file}")
-
-            # Use lazy evaluation to optimize memory usage
-            df = (
-                pl.scan_parquet(var_file)
-                .filter(pl.col("scenario_name").is_in(scenario_names))
-                .collect()
-            )
-            dfs.append(df)
+            var_files[self._original_names.get(var, var)] = var_file
 
         # Union all variables
-        result = pl.concat(dfs) if len(dfs) > 1 else dfs[0]
+        result = self._scan_variables(var_files, scenarios)
 
-        # Join time
-        result = result.join(self.time, on="step", how="left")
-
-        # Filter time range if specified
+        # Filter time range if specified. With time ascending in step, the range
+        # is a step interval on a stored column, so it reaches the Parquet scan
+        # and drops rows before time is attached
         if time_range:
             start, end = time_range
+            if self._time_ascending:
+                first = self.time_values.search_sorted(start, side="left")
+                stop = self.time_values.search_sorted(end, side="right")
+                result = result.filter(
+                    (pl.col("step") >= first) & (pl.col("step") < stop)
+                )
+
+        # Attach time by gathering on step (no hash join over millions of rows)
+        if self._steps_dense:
+            result = result.with_columns(
+                pl.lit(self.time_values).gather(pl.col("step")).alias("time")
+            )
+        else:
+            result = result.join(
+                self.time.lazy().select(
+                    pl.col("step").cast(result.collect_schema()["step"]), "time"
+                ),
+                on="step",
+                how="inner",
+            )
+        if time_range and not self._time_ascending:
             result = result.filter((pl.col("time") >= start) & (pl.col("time") <= end))
 
-        # Join parameters if requested
+        # Attach scenario_name (and parameters if requested) via the integer key
         if include_params:
-            result = result.join(scenarios, on="scenario_name", how="left")
+            attach = scenarios
+        else:
+            attach = scenarios.select("scenario_id", "scenario_name")
+        if attach.height == 1:
+            # A single scenario (e.g. every parameter pinned): its columns are
+            # constants, so attach them as literals instead of joining
+            row = attach.row(0, named=True)
+            result = result.with_columns(
+                pl.lit(row[c], dtype=dtype).alias(c)
+                for c, dtype in attach.schema.items()
+                if c != "scenario_id"
+            )
+        elif self._ids_dense:
+            # Gather by position from the full table (ids are row numbers);
+            # about twice as fast as a hash join over millions of rows
+            result = result.with_columns(
+                pl.lit(self.scenarios.get_column(c)).gather(pl.col("scenario_id"))
+                for c in attach.columns
+                if c != "scenario_id"
+            )
+        else:
+            result = result.join(attach.lazy(), on="scenario_id", how="left")
 
-        return result
+        # Streaming collect lets the scan predicates apply per row group
+        return result.select(
+            "scenario_name", pl.exclude("scenario_id", "scenario_name")
+        ).collect(engine="streaming")
 
     def get_series(
         self,
@@ -323,6 +874,9 @@ class ScenarioQuery:
                 - value
                 - [param1, param2, ...] (if include_params=True)
 
+            The frame may be shared with the query cache; treat it as read-only
+            (no in-place column assignment).
+
         Example:
             >>> query = ScenarioQuery()
             >>> data = query.get_series(
@@ -334,12 +888,15 @@ class ScenarioQuery:
             # ['scenario_name', 'variable', 'step', 'time', 'value', 'Fertility Variation', ...]
         """
         # Generate cache key
-        cache_key = self._generate_cache_key(variables, filters, time_range)
+        cache_key = self._generate_cache_key(
+            variables, filters, time_range, include_params
+        )
 
         # Check in-memory cache first
         with self._cache_lock:
             if cache_key in self.query_cache:
                 print(f"🎯 Cache hit for query: {variables}")
+                self.query_cache.move_to_end(cache_key)
                 return self.query_cache[cache_key]
 
         # Check default scenario cache for single variable queries
@@ -349,14 +906,13 @@ class ScenarioQuery:
             and variables in self.default_scenario_cache
         ):
             print(f"⚡ Default cache hit for: {variables}")
-            result = self.default_scenario_cache[variables].clone()
+            lf = self.default_scenario_cache[variables]
 
-            # Apply time range filter if specified
+            # Apply time range filter if specified (pushed into the scan)
             if time_range:
                 start, end = time_range
-                result = result.filter(
-                    (pl.col("time") >= start) & (pl.col("time") <= end)
-                )
+                lf = lf.filter((pl.col("time") >= start) & (pl.col("time") <= end))
+            result = lf.collect()
 
             # Cache the result
             self._cache_result(cache_key, result)
@@ -371,7 +927,7 @@ class ScenarioQuery:
 
         return result
 
-    def _cache_result(self, cache_key: str, result: pl.DataFrame):
+    def _cache_result(self, cache_key: Tuple, result: pl.DataFrame):
         """Cache a query result with thread safety.
 
         Args:
@@ -379,14 +935,12 @@ class ScenarioQuery:
             result: DataFrame result to cache
         """
         with self._cache_lock:
-            # Manage cache size
+            # Manage cache size: evict the least recently used entry
             if len(self.query_cache) >= self.cache_max_size:
-                # Remove oldest entry (simple FIFO)
-                oldest_key = next(iter(self.query_cache))
-                del self.query_cache[oldest_key]
+                self.query_cache.popitem(last=False)
 
-            # Cache the result
-            self.query_cache[cache_key] = result.clone()
+            # Frames are shared, not copied; callers treat them as read-only
+            self.query_cache[cache_key] = result
 
         # Skip disk cache in Docker environment (read-only filesystem)
         # cache_file = self.cache_dir / f"{cache_key}.pkl"
@@ -401,6 +955,11 @@ class ScenarioQuery:
         with self._cache_lock:
             self.query_cache.clear()
             self.default_scenario_cache.clear()
+        with self._var_cache_lock:
+            self._var_cache.clear()
+            self._var_cache_bytes = 0
+        with self._filter_memo_lock:
+            self._filter_memo.clear()
 
         # Skip disk cache clearing in Docker environment (read-only filesystem)
         # for cache_file in self.cache_dir.glob("*.pkl"):
@@ -423,6 +982,8 @@ class ScenarioQuery:
         return {
             "memory_cache_size": len(self.query_cache),
             "default_cache_size": len(self.default_scenario_cache),
+            "variable_cache_size": len(self._var_cache),
+            "variable_cache_bytes": self._var_cache_bytes,
             "disk_cache_files": disk_cache_files,
             "max_memory_cache_size": self.cache_max_size,
         }
@@ -468,18 +1029,66 @@ class ScenarioQuery:
             include_params=(columns_col is not None),
         )
 
-        # Drop 'variable' column if present (single variable query)
-        if "variable" in long.columns:
-            long = long.drop("variable")
-
         # Use scenario_name if no columns_col specified
         pivot_col = columns_col if columns_col else "scenario_name"
 
-        # Pivot
-        wide = long.pivot(values=values_col, index=index_col, columns=pivot_col)
+        # Few distinct values (the usual parameter case): filter out each column
+        # and join it on the index instead of a group-by pivot. Duplicate
+        # (index, column) pairs go to pivot, which reports them as an error.
+        pivot_values = long.get_column(pivot_col).unique(maintain_order=True)
+        if (
+            pivot_values.len() <= WIDE_LOOP_MAX_COLUMNS
+            and not long.select(index_col, pivot_col).is_duplicated().any()
+        ):
+            wide = long.select(index_col).unique(maintain_order=True)
+            for value in pivot_values.to_list():
+                column = long.filter(pl.col(pivot_col) == value).select(
+                    index_col, pl.col(values_col).alias(str(value))
+                )
+                wide = wide.join(column, on=index_col, how="left")
+            return wide
+
+        # Pivot. Pre-sorting by the index (stable, so column order is kept) lets
+        # pivot write each output row sequentially, and categorical keys avoid
+        # string hashing; ~3x faster for one column per scenario
+        if long.schema[pivot_col] == pl.String:
+            long = long.with_columns(pl.col(pivot_col).cast(pl.Categorical))
+        long = long.sort(index_col, maintain_order=True)
+        wide = long.pivot(on=pivot_col, index=index_col, values=values_col)
 
         return wide
 
+    def to_numpy(self, result: pl.DataFrame) -> Dict[str, np.ndarray]:
+        """Convert a query result into one numpy array per column.
+
+        Numeric columns keep their stored dtype (``value`` stays Float32) and are
+        returned as read-only views of the Polars buffers once the frame is a
+        single chunk. String and categorical columns are copied to object arrays,
+        and numeric columns with nulls (gaps in a wide frame) are copied to NaN.
+        Calling ``get_series`` with ``include_params=False`` is the fast path:
+        each parameter column adds another full-length array to the output.
+
+        Args:
+            result: DataFrame returned by ``get_series`` or ``get_series_wide``
+
+        Returns:
+            Dict mapping column name to numpy array.
+
+        Example:
+            >>> query = ScenarioQuery()
+            >>> data = query.get_series("YRB WSI", include_params=False)
+            >>> arrays = query.to_numpy(data)
+            >>> arrays["value"].dtype
+            dtype('float32')
+        """
+        result = result.rechunk()
+        return {
+            name: col.to_numpy(
+                allow_copy=not col.dtype.is_numeric() or col.null_count() > 0
+            )
+            for name, col in zip(result.columns, result)
+        }
+
     def get_param_summary(self, filters: Optional[Dict] = None) -> pl.DataFrame:
         """Get summary statistics of parameters across filtered scenarios.
 
@@ -495,17 +1104,21 @@ class ScenarioQuery:
             >>> print(summary)
             # Shows distribution of other parameters when Fertility=1.6
         """
-        scenarios = self.filter_scenarios(filters) if filters else self.scenarios
+        mask = self._scenario_mask(filters) if filters else None
+        n_scenarios = self.scenarios.height if mask is None else int(mask.sum())
 
         summaries = []
         for param in self.param_cols:
-            unique_vals = scenarios.get_column(param).unique().sort().to_list()
+            values = self._param_arrays[param]
+            if mask is not None:
+                values = values[mask]
+            unique_vals = np.unique(values).tolist()
             summaries.append(
                 {
                     "parameter": param,
                     "n_unique": len(unique_vals),
                     "values": str(unique_vals),
-                    "n_scenarios": scenarios.height,
+                    "n_scenarios": n_scenarios,
                 }
             )
 
@@ -514,18 +1127,13 @@ class ScenarioQuery:
     def list_variables(self) -> List[str]:
         """List all available variables in the data directory.
 
+        The directory is scanned once, when the query engine is created.
+
         Returns:
-            List of variable names (filenames without .parquet extension).
+            List of variable names (original names where a mapping exists,
+            else filenames without .parquet extension).
         """
-        parquet_files = list(self.data_dir.glob("*.parquet"))
-        variables = [
-            f.stem for f in parquet_files if f.stem not in ["time", "scenarios"]
-        ]
-        # Prefer original names if mapping exists
-        if self.variables_map:
-            inv = {v: k for k, v in self.variables_map.items()}
-            variables = [inv.get(v, v) for v in variables]
-        return sorted(set(variables))
+        return sorted(self._variable_files)
 
 
 # ---------------------- Convenience Functions ----------------------
@@ -536,7 +1144,8 @@ def quick_query(
     filters: Dict[str, Union[float, int, str, List]],
     data_dir: Union[str, Path] = "data_parquet",
     time_range: Optional[Tuple[float, float]] = None,
-) -> pl.DataFrame:
+    as_numpy: bool = False,
+) -> Union[pl.DataFrame, Dict[str, np.ndarray]]:
     """Quick one-liner query for a single variable with filters.
 
     Args:
@@ -544,9 +1153,12 @@ def quick_query(
         filters: Parameter constraints
         data_dir: Parquet data directory
         time_range: Optional (start, end) time filter
+        as_numpy: Return numpy arrays (see ``ScenarioQuery.to_numpy``) instead
+            of a DataFrame
 
     Returns:
-        Long-form DataFrame with scenario_name, step, time, value, and parameters.
+        Long-form DataFrame with scenario_name, step, time, value, and parameters,
+        or a dict of numpy arrays when ``as_numpy`` is True.
 
     Example:
         >>> data = quick_query(
@@ -556,7 +1168,8 @@ def quick_query(
         ... )
     """
     query = ScenarioQuery(data_dir)
-    return query.get_series(variable, filters=filters, time_range=time_range)
+    result = query.get_series(variable, filters=filters, time_range=time_range)
+    return query.to_numpy(result) if as_numpy else result
 
 
 def compare_params(
@@ -565,7 +1178,8 @@ def compare_params(
     vary_param: str,
     data_dir: Union[str, Path] = "data_parquet",
     time_range: Optional[Tuple[float, float]] = None,
-) -> pl.DataFrame:
+    as_numpy: bool = False,
+) -> Union[pl.DataFrame, Dict[str, np.ndarray]]:
     """Compare impact of one varying parameter while fixing others.
 
     Args:
@@ -574,9 +1188,12 @@ def compare_params(
         vary_param: Parameter to vary (will become columns in output)
         data_dir: Parquet data directory
         time_range: Optional time filter
+        as_numpy: Return numpy arrays (see ``ScenarioQuery.to_numpy``) instead
+            of a DataFrame
 
     Returns:
-        Wide-form DataFrame with time as index and vary_param values as columns.
+        Wide-form DataFrame with time as index and vary_param values as columns,
+        or a dict of numpy arrays when ``as_numpy`` is True.
 
     Example:
         >>> comparison = compare_params(
@@ -588,12 +1205,13 @@ def compare_params(
         >>> # Result: rows=years, columns=[0.8, 0.9, 1.0] (different irrigation efficiencies)
     """
     query = ScenarioQuery(data_dir)
-    return query.get_series_wide(
+    result = query.get_series_wide(
         variable=variable,
         filters=fixed_params,
         time_range=time_range,
         columns_col=vary_param,
     )
+    return query.to_numpy(result) if as_numpy else result
 
 
 # ---------------------- CLI Interface (Optional) ----------------------
@@ -618,12 +1236,21 @@ if __name__ == "__main__":
         help="Filters as JSON string, e.g. '{\"Fertility Variation\": 1.6}'",
     )
     parser.add_argument("--output", type=Path, help="Output CSV path (optional)")
+    parser.add_argument(
+        "--build-default-cache",
+        action="store_true",
+        help="Write default scenario results to <data-dir>/cache for fast startup",
+    )
 
     args = parser.parse_args()
 
     query = ScenarioQuery(args.data_dir)
 
-    if args.list_vars:
+    if args.build_default_cache:
+        for cache_file in query.build_default_cache():
+            print(f"Saved {cache_file}")
+
+    elif args.list_vars:
         print("Available variables:")
         for var in query.list_variables():
             print(f"  - {var}")
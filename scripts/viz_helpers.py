@@ -18,12 +18,65 @@ Usage:
 Google-style docstrings are used.
 """
 
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import polars as pl
 
+# Time points (counted before downsampling) above which plot_multi_scenario
+# renders with WebGL (scattergl) instead of SVG, which slows down markedly on
+# long series
+WEBGL_MIN_POINTS = 5000
+
+
+@lru_cache(maxsize=256)
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """Parse a hex color once per distinct value (figures reuse a few colors)."""
+    return px.colors.hex_to_rgb(color)
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Select points of a line with Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point and, from each of ``n_out - 2`` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket, which preserves
+    peaks and troughs far better than striding.
+
+    Args:
+        x: Sorted x values
+        y: y values aligned with ``x``
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted row indices of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # The next bucket's mean is the third vertex (last point for the final bucket)
+        next_lo, next_hi = (
+            (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        )
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        kept[i + 1] = a
+    return kept
+
 
 def plot_multi_scenario(
     data: pl.DataFrame,
@@ -36,6 +89,7 @@ def plot_multi_scenario(
     color: str = "#2E86AB",
     height: int = 600,
     width: int = 1000,
+    max_points: Optional[int] = 4000,
 ) -> go.Figure:
     """Plot multi-scenario time series with statistics.
 
@@ -53,6 +107,8 @@ def plot_multi_scenario(
         color: Primary color for the mean line
         height: Plot height in pixels
         width: Plot width in pixels
+        max_points: Downsample longer series to this many time points with
+            LTTB (chosen on the mean line, shared by all traces); None keeps all
 
     Returns:
         Plotly Figure object
@@ -74,21 +130,26 @@ def plot_multi_scenario(
         ... )
         >>> fig.show()
     """
-    # Calculate statistics
-    stats = (
-        data.group_by("time")
-        .agg(
-            [
-                pl.col("value").mean().alias("mean"),
-                pl.col("value").std().alias("std"),
-                pl.col("value").min().alias("min"),
-                pl.col("value").max().alias("max"),
-                pl.col("value").quantile(0.05).alias("p05"),
-                pl.col("value").quantile(0.95).alias("p95"),
-                pl.col("scenario_name").n_unique().alias("n_scenarios"),
-            ]
-        )
-        .with_columns(
+    # Calculate only the statistics that are drawn. std is always needed for
+    # the mean line's hover text; quantiles (a sort per group) are the costliest
+    aggs = [
+        pl.col("value").mean().alias("mean"),
+        pl.col("value").std().alias("std"),
+        pl.col("scenario_name").n_unique().alias("n_scenarios"),
+    ]
+    if show_range:
+        aggs += [
+            pl.col("value").min().alias("min"),
+            pl.col("value").max().alias("max"),
+        ]
+    if show_quantiles:
+        aggs += [
+            pl.col("value").quantile(0.05).alias("p05"),
+            pl.col("value").quantile(0.95).alias("p95"),
+        ]
+    stats = data.lazy().group_by("time").agg(aggs)
+    if show_ci:
+        stats = stats.with_columns(
             [
                 # Calculate standard error for 95% CI of the mean (not observation uncertainty)
                 # Handle null std and ensure n_scenarios > 0
@@ -101,20 +162,53 @@ def plot_multi_scenario(
                     .otherwise(pl.col("std").fill_null(0))
                 ).alias("se"),
             ]
-        )
-        .with_columns(
+        ).with_columns(
             [
-                (pl.col("mean") - 1.96 * pl.col("se")).alias("ci_lower"),
-                (pl.col("mean") + 1.96 * pl.col("se")).alias("ci_upper"),
+                # Float32 like the other drawn columns, so they leave as views
+                (pl.col("mean") - 1.96 * pl.col("se"))
+                .cast(pl.Float32)
+                .alias("ci_lower"),
+                (pl.col("mean") + 1.96 * pl.col("se"))
+                .cast(pl.Float32)
+                .alias("ci_upper"),
             ]
         )
-        .sort("time")
-    )
+    stats = stats.sort("time").collect()
+    # Decided on the full length: the max_points default is below the threshold
+    use_webgl = stats.height > WEBGL_MIN_POINTS
+
+    if max_points is not None and stats.height > max_points:
+        # One index set for all columns keeps the band pairs on the same x
+        stats = stats[
+            _lttb_indices(
+                stats.get_column("time").to_numpy().astype(np.float64),
+                stats.get_column("mean").to_numpy().astype(np.float64),
+                max_points,
+            )
+        ]
 
     n_scenarios = stats["n_scenarios"][0]
 
-    # Convert to pandas for Plotly
-    stats_pd = stats.to_pandas()
+    # Hand Plotly NumPy views of only the columns that are drawn (no pandas copy)
+    def column(name: str) -> np.ndarray:
+        return stats.get_column(name).to_numpy()
+
+    # Plotted values go out as float32 typed arrays: half the figure payload,
+    # and the stored values are float32 to begin with. Time keeps its dtype.
+    # The aggregates are contiguous and null-free, so this is a view, not a copy
+    def y_values(name: str) -> np.ndarray:
+        return column(name).astype(np.float32, copy=False)
+
+    x = column("time")
+
+    # Parse the hex color once for the three shaded bands
+    r, g, b = _hex_to_rgb(color)
+
+    def fill(alpha: float) -> str:
+        return f"rgba({r}, {g}, {b}, {alpha})"
+
+    # All traces share one type so the "tonexty" band pairs fill correctly
+    scatter = go.Scattergl if use_webgl else go.Scatter
 
     # Create figure
     fig = go.Figure()
@@ -122,9 +216,9 @@ def plot_multi_scenario(
     # Add min-max range (lightest shade)
     if show_range:
         fig.add_trace(
-            go.Scatter(
-                x=stats_pd["time"],
-                y=stats_pd["max"],
+            scatter(
+                x=x,
+                y=y_values("max"),
                 fill=None,
                 mode="lines",
                 line=dict(color=color, width=0),
@@ -133,13 +227,13 @@ def plot_multi_scenario(
             )
         )
         fig.add_trace(
-            go.Scatter(
-                x=stats_pd["time"],
-                y=stats_pd["min"],
+            scatter(
+                x=x,
+                y=y_values("min"),
                 fill="tonexty",
                 mode="lines",
                 line=dict(color=color, width=0),
-                fillcolor=f"rgba{tuple(list(px.colors.hex_to_rgb(color)) + [0.1])}",
+                fillcolor=fill(0.1),
                 name="Min-Max Range",
                 hovertemplate="<b>Min-Max Range</b><br>Time: %{x}<br>Min: %{y:.2f}<extra></extra>",
             )
@@ -148,9 +242,9 @@ def plot_multi_scenario(
     # Add quantile range (medium shade)
     if show_quantiles:
         fig.add_trace(
-            go.Scatter(
-                x=stats_pd["time"],
-                y=stats_pd["p95"],
+            scatter(
+                x=x,
+                y=y_values("p95"),
                 fill=None,
                 mode="lines",
                 line=dict(color=color, width=0),
@@ -159,13 +253,13 @@ def plot_multi_scenario(
             )
         )
         fig.add_trace(
-            go.Scatter(
-                x=stats_pd["time"],
-                y=stats_pd["p05"],
+            scatter(
+                x=x,
+                y=y_values("p05"),
                 fill="tonexty",
                 mode="lines",
                 line=dict(color=color, width=0),
-                fillcolor=f"rgba{tuple(list(px.colors.hex_to_rgb(color)) + [0.2])}",
+                fillcolor=fill(0.2),
                 name="5th-95th Percentile",
                 hovertemplate="<b>5th-95th Percentile</b><br>Time: %{x}<br>P05: %{y:.2f}<extra></extra>",
             )
@@ -174,9 +268,9 @@ def plot_multi_scenario(
     # Add confidence interval (darker shade)
     if show_ci:
         fig.add_trace(
-            go.Scatter(
-                x=stats_pd["time"],
-                y=stats_pd["ci_upper"],
+            scatter(
+                x=x,
+                y=y_values("ci_upper"),
                 fill=None,
                 mode="lines",
                 line=dict(color=color, width=0),
@@ -185,27 +279,28 @@ def plot_multi_scenario(
             )
         )
         fig.add_trace(
-            go.Scatter(
-                x=stats_pd["time"],
-                y=stats_pd["ci_lower"],
+            scatter(
+                x=x,
+                y=y_values("ci_lower"),
                 fill="tonexty",
                 mode="lines",
                 line=dict(color=color, width=0),
-                fillcolor=f"rgba{tuple(list(px.colors.hex_to_rgb(color)) + [0.3])}",
+                fillcolor=fill(0.3),
                 name="95% Confidence Interval",
                 hovertemplate="<b>95% CI</b><br>Time: %{x}<br>CI Lower: %{y:.2f}<extra></extra>",
             )
         )
 
-    # Add mean line (solid)
+    # Add mean line (solid); hover shows std, left blank where it is undefined
+    std = column("std")
     fig.add_trace(
-        go.Scatter(
-            x=stats_pd["time"],
-            y=stats_pd["mean"],
+        scatter(
+            x=x,
+            y=y_values("mean"),
             mode="lines",
             line=dict(color=color, width=3),
             name=f"Mean ({n_scenarios} scenarios)",
-            text=stats_pd["std"].round(2).astype(str),
+            text=np.where(np.isnan(std), None, std.round(2).astype(str)),
             hovertemplate="<b>Mean</b><br>Time: %{x}<br>Value: %{y:.2f}<br>±Std: %{text}<extra></extra>",
         )
     )
@@ -272,7 +367,9 @@ def plot_scenario_comparison(
         ... )
         >>> fig.show()
     """
-    # Group by parameter and calculate statistics
+    # Group by parameter and calculate statistics. Hash grouping beats sorting
+    # the scenario-major rows first; the small result is sorted once, by group
+    # then time, which serves both the line traces and the band slices
     stats = (
         data.group_by(["time", group_by])
         .agg(
@@ -290,15 +387,12 @@ def plot_scenario_comparison(
                 ),
             ]
         )
-        .sort(["time", group_by])
+        .sort([group_by, "time"])
     )
 
-    # Convert to pandas
-    stats_pd = stats.to_pandas()
-
-    # Create figure with one line per group
+    # Create figure with one line per group (Plotly reads Polars frames directly)
     fig = px.line(
-        stats_pd,
+        stats.with_columns(pl.col("mean").cast(pl.Float32)),
         x="time",
         y="mean",
         color=group_by,
@@ -307,25 +401,34 @@ def plot_scenario_comparison(
         labels={"time": xlabel, "mean": ylabel},
     )
 
-    # Add error bands for each group
-    for group_value in stats_pd[group_by].unique():
-        group_data = stats_pd[stats_pd[group_by] == group_value]
+    # CI bands (standard error of the mean): slice the NumPy columns at the
+    # group boundaries
+    bands = stats.select(
+        group_by,
+        "time",
+        (pl.col("mean") + 1.96 * pl.col("se")).cast(pl.Float32).alias("upper"),
+        (pl.col("mean") - 1.96 * pl.col("se")).cast(pl.Float32).alias("lower"),
+    )
+    groups = bands.get_column(group_by).to_numpy()
+    bounds = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    starts = np.concatenate([[0], bounds]).astype(int) if groups.size else []
+    time = np.split(bands.get_column("time").to_numpy(), bounds)
+    upper = np.split(bands.get_column("upper").to_numpy(), bounds)
+    lower = np.split(bands.get_column("lower").to_numpy(), bounds)
 
-        # Get color from existing trace
-        trace_color = None
-        for trace in fig.data:
-            if trace.name == str(group_value):
-                trace_color = trace.line.color
-                break
+    # Band fill per line trace, keyed by trace name (= str of the group value)
+    def band_fill(line_color: Optional[str]) -> str:
+        return f'rgba{tuple(list(_hex_to_rgb(line_color or "#888888")) + [0.2])}'
 
-        # Add CI band (using standard error for mean)
+    fill_by_name = {trace.name: band_fill(trace.line.color) for trace in fig.data}
+
+    for start, t, up, lo in zip(starts, time, upper, lower):
         fig.add_trace(
             go.Scatter(
-                x=group_data["time"].tolist() + group_data["time"].tolist()[::-1],
-                y=(group_data["mean"] + 1.96 * group_data["se"]).tolist()
-                + (group_data["mean"] - 1.96 * group_data["se"]).tolist()[::-1],
+                x=np.concatenate([t, t[::-1]]),
+                y=np.concatenate([up, lo[::-1]]),
                 fill="toself",
-                fillcolor=f'rgba{tuple(list(px.colors.hex_to_rgb(trace_color or "#888888")) + [0.2])}',
+                fillcolor=fill_by_name.get(str(groups[start])) or band_fill(None),
                 line=dict(color="rgba(255,255,255,0)"),
                 showlegend=False,
                 hoverinfo="skip",
@@ -356,6 +459,7 @@ def plot_heatmap(
     height: int = 600,
     width: int = 800,
     colorscale: str = "Viridis",
+    year: Optional[int] = None,
 ) -> go.Figure:
     """Create a heatmap showing how two parameters affect outcomes.
 
@@ -368,6 +472,7 @@ def plot_heatmap(
         height: Plot height in pixels
         width: Plot width in pixels
         colorscale: Plotly colorscale name
+        year: Year to analyze (None = aggregate across all years)
 
     Returns:
         Plotly Figure object
@@ -391,24 +496,33 @@ def plot_heatmap(
         "min": pl.col("value").min(),
     }.get(aggregate_func, pl.col("value").mean())
 
-    # Create pivot table
+    if year is not None:
+        data = data.filter(pl.col("time") == year)
+
+    # Aggregate and pivot in one pass; sorting first fixes both axes in
+    # ascending parameter order (group_by alone returns groups in any order)
     pivot_data = (
         data.group_by([param1, param2])
         .agg(agg_expr.alias("agg_value"))
-        .pivot(values="agg_value", index=param2, columns=param1)
+        .sort([param2, param1])
+        .pivot(on=param1, index=param2, values="agg_value")
     )
+    x_labels = pivot_data.columns[1:]
+
+    z = pivot_data.select(x_labels).to_numpy().astype(np.float32, copy=False)
 
-    # Convert to pandas
-    pivot_pd = pivot_data.to_pandas().set_index(param2)
+    # Hover labels formatted once in NumPy; empty for missing combinations
+    hover_text = np.where(np.isnan(z), "", np.char.mod("%.2f", z))
 
-    # Create heatmap
+    # Create heatmap from NumPy arrays (param2 values label the rows)
     fig = go.Figure(
         data=go.Heatmap(
-            z=pivot_pd.values,
-            x=pivot_pd.columns,
-            y=pivot_pd.index,
+            z=z,
+            x=x_labels,
+            y=pivot_data.get_column(param2).to_numpy(),
+            text=hover_text,
             colorscale=colorscale,
-            hovertemplate=f"{param1}: %{{x}}<br>{param2}: %{{y}}<br>Value: %{{z:.2f}}<extra></extra>",
+            hovertemplate=f"{param1}: %{{x}}<br>{param2}: %{{y}}<br>Value: %{{text}}<extra></extra>",
         )
     )
 
@@ -461,14 +575,20 @@ def plot_distribution(
         plot_data = data
         year_str = " (All Years)"
 
-    # Convert to pandas
-    values = plot_data["value"].to_pandas()
+    # Zero-copy view of the value column (nulls come through as NaN); only
+    # copy when there are missing values to drop, which np.histogram rejects
+    values = plot_data.get_column("value").to_numpy()
+    missing = np.isnan(values)
+    if missing.any():
+        values = values[~missing]
 
-    # Create histogram
+    # Bin here so the figure carries 30 bars instead of every value
+    counts, edges = np.histogram(values, bins=30)
     fig = go.Figure(
-        data=go.Histogram(
-            x=values,
-            nbinsx=30,
+        data=go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
             marker_color=color,
             opacity=0.7,
             hovertemplate="Value: %{x:.2f}<br>Count: %{y}<extra></extra>",
@@ -476,7 +596,7 @@ def plot_distribution(
     )
 
     # Add statistics annotation
-    mean_val = values.mean()
+    mean_val = values.mean(dtype=np.float64)
 
     fig.add_vline(
         x=mean_val,
@@ -529,12 +649,15 @@ def quick_plot(
         ... )
         >>> fig.show()
     """
-    # Query data
+    # Query data; plots of a single year only fetch that year
     include_params = plot_type in ["comparison", "heatmap"]
+    time_range = kwargs.pop("time_range", (2020, 2100))
+    if plot_type in ["distribution", "heatmap"] and kwargs.get("year") is not None:
+        time_range = (kwargs["year"], kwargs["year"])
     data = query.get_series(
         variables=variable,
         filters=filters,
-        time_range=kwargs.pop("time_range", (2020, 2100)),
+        time_range=time_range,
         include_params=include_params,
     )
 
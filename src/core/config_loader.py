@@ -8,12 +8,71 @@ Google-style docstrings are used.
 
 from __future__ import annotations
 
-import json
+import os
+import pickle
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import IO, Any, Callable, Dict, Optional
 
 import yaml  # type: ignore[import-untyped]
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+# orjson's parser when installed (optional), else the stdlib one
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - orjson is optional
+    from json import loads as _json_loads
+
+
+def _load_cached(path: Path, parser: Callable[[IO[str]], Any]) -> Any:
+    """Parse a config file, reusing a pickled copy while the file is unchanged.
+
+    The parsed result is stored next to the file as ``<name>.pkl`` and reused
+    while it is at least as new as the file. Failing to write the sidecar
+    (e.g. a read-only config mount) only costs the speedup.
+
+    Args:
+        path: Config file to load.
+        parser: Function parsing an open text file (e.g. ``_parse_json``).
+
+    Returns:
+        The parsed content.
+    """
+    cache_path = path.with_suffix(path.suffix + ".pkl")
+    try:
+        if cache_path.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = parser(f)
+
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+    return data
+
+
+def _parse_yaml(f: IO[str]) -> Any:
+    """Parse YAML with the fastest available safe loader."""
+    return yaml.load(f, Loader=_YamlLoader)
+
+
+def _parse_json(f: IO[str]) -> Any:
+    """Parse JSON with orjson when available, else the stdlib parser."""
+    return _json_loads(f.read())
+
 
 class ConfigLoader:
     """Load and manage application configuration files.
@@ -38,6 +97,20 @@ class ConfigLoader:
         self._scenarios_preset: Optional[Dict[str, Any]] = None
         self._explanations: Optional[Dict[str, Any]] = None
 
+        # Per-language views of the loaded config, built once on first request
+        self._terminology_cache: Dict[str, Dict[str, Any]] = {}
+        self._preset_scenarios_cache: Dict[str, list[Dict[str, Any]]] = {}
+        self._explanation_cache: Dict[tuple[str, str], Dict[str, Any]] = {}
+
+    def clear_cache(self) -> None:
+        """Drop loaded config files and per-language views so they are reloaded."""
+        self._app_config = None
+        self._scenarios_preset = None
+        self._explanations = None
+        self._terminology_cache.clear()
+        self._preset_scenarios_cache.clear()
+        self._explanation_cache.clear()
+
     def load_app_config(self) -> Dict[str, Any]:
         """Load main application configuration from app_config.yaml.
 
@@ -56,8 +129,7 @@ class ConfigLoader:
         if not config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
-        with open(config_path, "r", encoding="utf-8") as f:
-            self._app_config = yaml.safe_load(f)
+        self._app_config = _load_cached(config_path, _parse_yaml)
 
         return self._app_config
 
@@ -78,8 +150,7 @@ class ConfigLoader:
         if not config_path.exists():
             raise FileNotFoundError(f"Preset scenarios file not found: {config_path}")
 
-        with open(config_path, "r", encoding="utf-8") as f:
-            self._scenarios_preset = json.load(f)
+        self._scenarios_preset = _load_cached(config_path, _parse_json)
 
         return self._scenarios_preset
 
@@ -100,8 +171,7 @@ class ConfigLoader:
         if not config_path.exists():
             raise FileNotFoundError(f"Explanations file not found: {config_path}")
 
-        with open(config_path, "r", encoding="utf-8") as f:
-            self._explanations = yaml.safe_load(f)
+        self._explanations = _load_cached(config_path, _parse_yaml)
 
         return self._explanations
 
@@ -113,8 +183,12 @@ class ConfigLoader:
 
         Returns:
             Dictionary mapping parameter keys to their display information including
-            labels, descriptions, and options in the specified language.
+            labels, descriptions, and options in the specified language. The
+            result is cached per language and shared; do not modify it.
         """
+        if lang in self._terminology_cache:
+            return self._terminology_cache[lang]
+
         config = self.load_app_config()
         terminology = config.get("terminology", {})
 
@@ -137,6 +211,7 @@ class ConfigLoader:
                     for k, v in value["options"].items()
                 }
 
+        self._terminology_cache[lang] = result
         return result
 
     def get_water_stress_config(self) -> Dict[str, Any]:
@@ -201,7 +276,11 @@ class ConfigLoader:
 
         Returns:
             List of preset scenario dictionaries with translated names and descriptions.
+            The list is cached per language and shared; do not modify it.
         """
+        if lang in self._preset_scenarios_cache:
+            return self._preset_scenarios_cache[lang]
+
         scenarios_config = self.load_scenarios_preset()
         scenarios = scenarios_config.get("scenarios", [])
 
@@ -223,6 +302,7 @@ class ConfigLoader:
                 )
             result.append(translated)
 
+        self._preset_scenarios_cache[lang] = result
         return result
 
     def get_explanation(self, key: str, lang: str = "en") -> Optional[Dict[str, Any]]:
@@ -234,22 +314,30 @@ class ConfigLoader:
 
         Returns:
             Dictionary containing title and content in specified language,
-            or None if key not found.
+            or None if key not found. The result is cached and shared; do not
+            modify it.
         """
+        if (key, lang) in self._explanation_cache:
+            return self._explanation_cache[(key, lang)]
+
         explanations = self.load_explanations()
         explanation_data = explanations.get("explanations", {}).get(key)
 
         if not explanation_data:
+            # Not cached: keys come from request paths and are unbounded
             return None
 
-        return {
+        result = {
             "title": explanation_data.get("title", {}).get(lang, ""),
             "content": explanation_data.get("content", {}).get(lang, ""),
         }
+        self._explanation_cache[(key, lang)] = result
+        return result
 
 
 # Global config loader instance
 _config_loader: Optional[ConfigLoader] = None
+_config_loader_lock = threading.Lock()
 
 
 def get_config_loader() -> ConfigLoader:
@@ -260,5 +348,11 @@ def get_config_loader() -> ConfigLoader:
     """
     global _config_loader
     if _config_loader is None:
-        _config_loader = ConfigLoader()
+        # Double-checked so concurrent first callers share one instance and
+        # one parse; app config is loaded before the instance is published
+        with _config_loader_lock:
+            if _config_loader is None:
+                loader = ConfigLoader()
+                loader.load_app_config()
+                _config_loader = loader
     return _config_loader
@@ -0,0 +1,25 @@
+"""Shared fixtures: a tiny scenario dataset in the legacy and indexed layouts."""
+
+from pathlib import Path
+
+import pytest
+
+from tests.helper import migrate, write_legacy_dataset
+
+
+@pytest.fixture
+def legacy_dir(tmp_path: Path) -> Path:
+    """Dataset in the legacy layout."""
+    data_dir = tmp_path / "legacy"
+    write_legacy_dataset(data_dir)
+    return data_dir
+
+
+@pytest.fixture
+def migrated_dir(
+    legacy_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """The legacy dataset converted to the indexed layout in a separate directory."""
+    out_dir = tmp_path / "migrated"
+    migrate(legacy_dir, out_dir, monkeypatch)
+    return out_dir
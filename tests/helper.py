@@ -0,0 +1,86 @@
+"""Helpers building a tiny scenario dataset in the legacy and indexed layouts."""
+
+import itertools
+import json
+import sys
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from scripts import migrate_parquet_layout
+
+N_STEPS = 8
+VARIABLE = "Total population"
+VARIABLE_FILE = "total_population.parquet"
+
+
+def expected_value(scenario_id: int, step: int) -> float:
+    """Value stored for a (scenario, step) cell of the fixture variable."""
+    return scenario_id * 100 + step + 0.5
+
+
+def write_legacy_dataset(data_dir: Path) -> None:
+    """Write a 12-scenario dataset in the legacy step-major layout.
+
+    Variable rows are keyed by `scenario_name` and ordered by step, as in
+    datasets built before `scenario_id`; one cell is null.
+
+    Args:
+        data_dir: Directory to create and fill
+    """
+    data_dir.mkdir(parents=True)
+    combos = list(itertools.product([1.6, 1.7], [1, 2, 3], [0, 1]))
+    pl.DataFrame(
+        {
+            "scenario_name": [f"sc_{i}" for i in range(len(combos))],
+            "Fertility Variation": [c[0] for c in combos],
+            "Climate change scenario switch for water yield": [c[1] for c in combos],
+            "SNWTP": [c[2] for c in combos],
+        },
+        schema_overrides={"scenario_name": pl.Categorical},
+    ).write_parquet(data_dir / "scenarios.parquet")
+    pl.DataFrame(
+        {"step": range(N_STEPS), "time": [2020 + s / 4 for s in range(N_STEPS)]},
+        schema={"step": pl.UInt32, "time": pl.Float64},
+    ).write_parquet(data_dir / "time.parquet")
+
+    rows = [(sid, step) for step in range(N_STEPS) for sid in range(len(combos))]
+    pl.DataFrame(
+        {
+            "scenario_name": [f"sc_{sid}" for sid, _ in rows],
+            "step": [step for _, step in rows],
+            "value": [
+                None if (sid, step) == (3, 5) else expected_value(sid, step)
+                for sid, step in rows
+            ],
+            "variable": VARIABLE,
+        },
+        schema={
+            "scenario_name": pl.Categorical,
+            "step": pl.UInt32,
+            "value": pl.Float32,
+            "variable": pl.Categorical,
+        },
+    ).write_parquet(data_dir / VARIABLE_FILE, row_group_size=N_STEPS)
+    (data_dir / "variables_map.json").write_text(
+        json.dumps({VARIABLE: VARIABLE_FILE.removesuffix(".parquet")})
+    )
+
+
+def migrate(data_dir: Path, out_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run the migration CLI with one scenario per row group."""
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "migrate_parquet_layout.py",
+            "--data-dir",
+            str(data_dir),
+            "--out-dir",
+            str(out_dir),
+            "--row-group-size",
+            str(N_STEPS),
+        ],
+    )
+    migrate_parquet_layout.main()
@@ -0,0 +1,59 @@
+"""Tests for converting legacy variable files to the indexed layout."""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from tests.helper import N_STEPS, VARIABLE_FILE, migrate
+
+
+def test_variable_file_round_trip(legacy_dir: Path, migrated_dir: Path):
+    """Migrated rows map back to exactly the legacy (name, step, value) rows."""
+    migrated = pl.read_parquet(migrated_dir / VARIABLE_FILE)
+    assert migrated.schema == pl.Schema(
+        {"scenario_id": pl.UInt32, "step": pl.UInt16, "value": pl.Float32}
+    )
+    assert migrated.select("scenario_id", "step").equals(
+        migrated.select("scenario_id", "step").sort("scenario_id", "step")
+    )
+
+    names = pl.read_parquet(migrated_dir / "scenarios.parquet").select(
+        "scenario_id", pl.col("scenario_name").cast(pl.String)
+    )
+    restored = (
+        migrated.join(names, on="scenario_id")
+        .select("scenario_name", pl.col("step").cast(pl.UInt32), "value")
+        .sort("scenario_name", "step")
+    )
+    legacy = (
+        pl.read_parquet(legacy_dir / VARIABLE_FILE)
+        .select(pl.col("scenario_name").cast(pl.String), "step", "value")
+        .sort("scenario_name", "step")
+    )
+    assert restored.equals(legacy)
+
+
+def test_scenarios_and_indexes(legacy_dir: Path, migrated_dir: Path):
+    """scenario_id is the legacy row index and every id is in the row-group index."""
+    scenarios = pl.read_parquet(migrated_dir / "scenarios.parquet")
+    legacy = pl.read_parquet(legacy_dir / "scenarios.parquet")
+    assert scenarios.drop("scenario_id").equals(legacy)
+    assert scenarios["scenario_id"].to_list() == list(range(legacy.height))
+    assert "scenario_id" not in pl.read_parquet_schema(legacy_dir / "scenarios.parquet")
+
+    index = pl.read_parquet(migrated_dir / "index" / VARIABLE_FILE)
+    assert sorted(index["scenario_id"].to_list()) == list(range(legacy.height))
+    # One scenario per row group at this row-group size
+    assert index["row_group"].n_unique() == legacy.height
+    assert (migrated_dir / "index" / "params.parquet").exists()
+
+
+def test_rerun_leaves_migrated_files_unchanged(
+    migrated_dir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Running the migration again on an indexed dataset does not rewrite it."""
+    before = (migrated_dir / VARIABLE_FILE).read_bytes()
+    migrate(migrated_dir, migrated_dir, monkeypatch)
+    assert (migrated_dir / VARIABLE_FILE).read_bytes() == before
+    assert pl.read_parquet(migrated_dir / VARIABLE_FILE).height == 12 * N_STEPS